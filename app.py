@@ -1,13 +1,22 @@
 import streamlit as st
 import numpy as np
-import plotly.graph_objects as go
 import pandas as pd
-from scipy.stats import binom
-from scipy.stats import norm
-import plotly.express as px
 from PIL import Image
+import functools
+import io
 import os
 import warnings
+
+from graficos import figura_histograma, figura_lucro, figura_mapa_faixas, figura_risco, figura_tornado
+from motor import (calcular_roi, classificar_decisao, curva_lucro, curva_risco, iniciar_simulacao_roi,
+                   limite_vendas, risco_overbooking, simular_roi)
+from motor.decisao import FAIXAS, ORDEM_CRESCENTE, classificar_distribuicao, proporcoes_roi
+from motor.fluxo_caixa import simular_fluxo_caixa
+from motor.instrumentacao import cronometrar, etapa, iniciar_medicao, medicao_atual
+from motor.lote import COLUNAS_OBRIGATORIAS, otimizar_tabela
+from motor.paralelo import trabalhadores_padrao
+from motor.poisson_binomial import curva_lucro_segmentos, curva_risco_segmentos, limite_vendas_segmentos
+from motor.sensibilidade import VARIAVEIS, grade_decisao, tornado
 warnings.filterwarnings("ignore")
 
 # Configuração da página
@@ -24,27 +33,139 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Carregar logotipo
-caminho_imagem = os.path.join(os.path.dirname(__file__), "Logo", "unb_logo.png")
-logo_unb = Image.open(caminho_imagem)
+# Instrumentação: tempos por etapa desta execução (painel opcional na barra lateral)
+ARQUIVO_LOG_TEMPOS = os.environ.get("APP_LOG_TEMPOS")
+with st.sidebar.expander("Desempenho (depuração)"):
+    mostrar_tempos = st.checkbox("Mostrar tempos desta execução")
+    capturar_perfil = st.checkbox("Capturar perfil (cProfile)")
+
+
+def cache_medido(nome, cache):
+    """Aplica ``cache`` (``st.cache_data``/``st.cache_resource``) cronometrando a chamada.
+
+    Acertos e faltas são contados na medição desta sessão (``caches_pagina``):
+    a função original só roda numa falta.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def calcular(*args, **kwargs):
+            medicao = medicao_atual()
+            if medicao is not None:
+                medicao.contar_cache(nome, acerto=False)
+            return funcao(*args, **kwargs)
+
+        cacheada = cache(calcular)
+
+        @cronometrar(nome)
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            medicao = medicao_atual()
+            faltas = medicao.faltas_cache(nome) if medicao is not None else 0
+            resultado = cacheada(*args, **kwargs)
+            if medicao is not None and medicao.faltas_cache(nome) == faltas:
+                medicao.contar_cache(nome, acerto=True)
+            return resultado
+        return envoltorio
+    return decorador
+
+
+# Carregar logotipo (uma vez por processo, não a cada rerun)
+@cache_medido("logo", st.cache_resource)
+def carregar_logo():
+    caminho_imagem = os.path.join(os.path.dirname(__file__), "Logo", "unb_logo.png")
+    return Image.open(caminho_imagem)
+
+
+# Entradas por função cacheada (tabela e gráficos), compartilhadas entre sessões
+MAX_ENTRADAS_CACHE = int(os.environ.get("APP_CACHE_ENTRADAS", "256"))
+# Figuras ficam em st.cache_resource: o st.cache_data desserializaria a
+# go.Figure a cada acerto (~18 ms), e guardar o JSON ou o dict não ajuda
+# porque o st.plotly_chart revalida dicts montando uma go.Figure. As figuras
+# nunca são alteradas depois de montadas, então compartilhar o objeto é seguro.
+CACHE_FIGURAS = st.cache_resource(max_entries=MAX_ENTRADAS_CACHE)
+
+
+@cache_medido("aba1.tabela", st.cache_data(max_entries=MAX_ENTRADAS_CACHE))
+def montar_tabela_riscos(capacidade, p):
+    curva = curva_risco(capacidade, p)
+    return pd.DataFrame({"Passagens Vendidas": curva.vendas, "Risco de Overbooking (%)": (curva.riscos * 100).round(2)})
+
+
+@cache_medido("aba1.figura_risco", CACHE_FIGURAS)
+def montar_figura_risco(capacidade, p, risco_maximo):
+    curva = curva_risco(capacidade, p)
+    return figura_risco(curva.vendas, curva.riscos, risco_maximo)
 
-# Cabeçalho com logotipo e título
-col1, col2, col3 = st.columns([1, 6, 1])
-with col1:
-    st.image(logo_unb, use_container_width=True)
-with col2:
-    st.markdown("<h1 style='text-align: center; color: #003366;'>Análise de Distribuições de Probabilidade</h1>", unsafe_allow_html=True)
-    st.markdown("<h3 style='text-align: center; color: #003366;'>Pedro Richetti Russo e Daniel Vianna</h3>", unsafe_allow_html=True)
-with col3:
-    st.image(logo_unb, use_container_width=True)
 
-st.markdown("---")
+@cache_medido("aba1.figura_lucro", CACHE_FIGURAS)
+def montar_figura_lucro(capacidade, p, receita_passagem, custo_indenizacao, excesso):
+    curva = curva_lucro(capacidade, p, receita_passagem, custo_indenizacao)
+    return figura_lucro(curva.excessos, curva.lucros, curva.custos, curva.excesso_otimo, excesso)
+
+
+@cache_medido("aba2.figura_roi", CACHE_FIGURAS)
+def montar_figura_roi(investimento, receita_media, desvio, custo_operacional, simulacoes, receita_limite, semente):
+    simulacao = simular_roi_cacheado(investimento, receita_media, desvio, custo_operacional, simulacoes,
+                                     receita_limite, semente, 1)
+    bordas, contagens = simulacao.histograma.reagrupar(30, simulacao.minimo, simulacao.maximo)
+    return figura_histograma(bordas, contagens, "Distribuição do ROI Simulado", "ROI (%)")
+
+
+@cache_medido("aba1.lote", st.cache_data(max_entries=16))
+def otimizar_frota(conteudo, nome_arquivo, risco_maximo):
+    if nome_arquivo.endswith(".parquet"):
+        voos = pd.read_parquet(io.BytesIO(conteudo))
+    else:
+        voos = pd.read_csv(io.BytesIO(conteudo))
+    return otimizar_tabela(voos, risco_maximo)
+
+
+@cache_medido("aba2.monte_carlo", st.cache_data(max_entries=16))
+def simular_roi_cacheado(investimento, receita_media, desvio, custo_operacional, simulacoes, receita_limite,
+                          semente, trabalhadores):
+    return simular_roi(investimento, receita_media, desvio, custo_operacional, simulacoes,
+                       receita_limite, semente=semente, trabalhadores=trabalhadores)
+
+
+# Cada aba é um fragmento: interagir com um widget reexecuta só a sua aba.
+# Chaves do session_state lidas por outro fragmento (aba3 e aba2.cauda). O
+# Streamlit não reexecuta um fragmento específico a partir de outro, então
+# quando uma delas muda a página inteira é reexecutada (os cálculos das
+# demais abas vêm do cache).
+CHAVES_COMPARTILHADAS = {"roi_percent", "parametros_roi", "fluxo_parametros", "parametros_cauda"}
+
+
+def publicar(chave, valor):
+    publicada = chave in st.session_state
+    anterior = st.session_state.get(chave)
+    st.session_state[chave] = valor
+    if publicada and anterior != valor and chave in CHAVES_COMPARTILHADAS:
+        st.rerun(scope="app")
+
+
+def fragmento(nome, run_every=None):
+    """``st.fragment`` que, nas reexecuções só da aba, mede e registra os tempos dela."""
+    def decorador(funcao):
+        @st.fragment(run_every=run_every)
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if medicao_atual() is not None:  # execução completa da página
+                return funcao(*args, **kwargs)
+            medicao = iniciar_medicao()
+            try:
+                with etapa(nome):
+                    return funcao(*args, **kwargs)
+            finally:
+                medicao.finalizar()
+                if ARQUIVO_LOG_TEMPOS:
+                    medicao.gravar_jsonl(ARQUIVO_LOG_TEMPOS)
+        return envoltorio
+    return decorador
 
-# Abas
-aba1, aba2, aba3 = st.tabs(["Overbooking", "Simulação de ROI", "Decisão e Análise Final"])
 
 # ------------------------------- ABA 1 - OVERBOOKING ------------------------------
-with aba1:
+@fragmento("aba1")
+def aba_overbooking():
     st.header("Simulação de Overbooking (Binomial)")
 
     st.markdown("#### Cálculo de Risco de Overbooking com Cenários Personalizáveis")
@@ -53,38 +174,21 @@ with aba1:
     assentos_vendidos = st.slider("Número de passagens vendidas", min_value=capacidade, max_value=capacidade + 30, value=130)
     p = st.slider("Probabilidade de comparecimento (p)", min_value=0.80, max_value=1.00, value=0.88, step=0.01)
 
-    risco = 1 - binom.cdf(capacidade, assentos_vendidos, p)
+    with etapa("aba1.risco"):
+        risco = risco_overbooking(capacidade, assentos_vendidos, p)
     st.write(f"### Probabilidade de mais de {capacidade} passageiros aparecerem: **{risco*100:.2f}%**")
 
     st.markdown("#### Defina o Limite Máximo de Risco Aceitável (%)")
     risco_maximo = st.slider("Risco Máximo (%)", min_value=1, max_value=20, value=7)
 
-    venda_range = np.arange(capacidade, capacidade + 21)
-    probs = 1 - binom.cdf(capacidade, venda_range, p)
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=venda_range, y=probs, mode='lines+markers', line=dict(color='#003366')))
-
-    # Linha horizontal indicando o limite de risco no eixo Y
-    fig.add_hline(y=risco_maximo / 100, line=dict(color='red', width=2, dash='dash'),
-                  annotation_text=f"Limite {risco_maximo}%", annotation_position="bottom right")
+    st.plotly_chart(montar_figura_risco(capacidade, p, risco_maximo), use_container_width=True)
 
-    fig.update_layout(title="Probabilidade de Overbooking (mais passageiros que assentos)",
-                      xaxis_title="Número de Passagens Vendidas",
-                      yaxis_title="Probabilidade (%)",
-                      yaxis=dict(range=[0, 1]),
-                      plot_bgcolor="white")
-    st.plotly_chart(fig, use_container_width=True)
-
-    tabela = pd.DataFrame({"Passagens Vendidas": venda_range, "Risco de Overbooking (%)": (probs * 100).round(2)})
     st.write("### Tabela de Riscos por Quantidade de Vendas")
-    st.dataframe(tabela)
+    st.dataframe(montar_tabela_riscos(capacidade, p))
 
-    limite_risco = tabela[tabela['Risco de Overbooking (%)'] <= risco_maximo]['Passagens Vendidas'].max()
-    if pd.notna(limite_risco):
-        st.success(f"Número máximo de passagens a serem vendidas com risco ≤ {risco_maximo}%: {limite_risco}")
-    else:
-        st.error("Nenhuma configuração está abaixo do risco definido.")
+    with etapa("aba1.limite_vendas"):
+        limite_risco = limite_vendas(capacidade, p, risco_maximo)
+    st.success(f"Número máximo de passagens a serem vendidas com risco ≤ {risco_maximo}%: {limite_risco}")
 
     # Análise Financeira
     st.markdown("#### Avaliação Financeira de Vendas Acima da Capacidade")
@@ -92,29 +196,85 @@ with aba1:
     custo_indenizacao = st.number_input("Custo médio por passageiro em overbooking (R$)", min_value=0, value=1000)
     receita_passagem = st.number_input("Receita por passagem extra vendida (R$)", min_value=0, value=500)
 
-    risco_extra = 1 - binom.cdf(capacidade, capacidade + excesso, p)
-    ganho_extra = receita_passagem * excesso
-    perda_esperada = risco_extra * custo_indenizacao
-    st.write(f"- Receita extra esperada: **R$ {ganho_extra:.2f}**")
-    st.write(f"- Custo esperado com overbooking: **R$ {perda_esperada:.2f}**")
+    with etapa("aba1.curva_lucro"):
+        lucro = curva_lucro(capacidade, p, receita_passagem, custo_indenizacao)
+    st.write(f"- Receita extra esperada: **R$ {lucro.receitas[excesso]:.2f}**")
+    st.write(f"- Passageiros preteridos esperados: **{lucro.preteridos[excesso]:.2f}**")
+    st.write(f"- Custo esperado com overbooking: **R$ {lucro.custos[excesso]:.2f}**")
 
-    if ganho_extra > perda_esperada:
+    if lucro.lucros[excesso] > 0:
         st.success("Compensa financeiramente vender essas passagens a mais.")
     else:
         st.warning("Não compensa financeiramente — o risco é maior que o ganho.")
 
+    st.plotly_chart(montar_figura_lucro(capacidade, p, receita_passagem, custo_indenizacao, excesso),
+                    use_container_width=True)
+    st.info(f"Excesso que maximiza o lucro esperado: **{lucro.excesso_otimo}** passagens "
+            f"(R$ {lucro.lucro_otimo:,.2f}).")
+
+    # Passageiros heterogêneos
+    with st.expander("Reservas com probabilidades diferentes por segmento (Poisson-binomial)"):
+        st.markdown("Informe as reservas atuais por segmento (classe tarifária, conexões, grupos...). "
+                    "As passagens extras são vendidas com a probabilidade de comparecimento abaixo.")
+        reservas = st.data_editor(
+            pd.DataFrame({"Segmento": ["Executiva", "Econômica", "Conexões", "Grupos"],
+                          "Reservas": [16, 80, 14, 10],
+                          "p": [0.95, 0.90, 0.82, 0.75]}),
+            num_rows="dynamic", hide_index=True, key="segmentos")
+        p_extra = st.slider("Probabilidade de comparecimento das passagens extras", min_value=0.50,
+                            max_value=1.00, value=0.88, step=0.01)
+        reservas = reservas.dropna(subset=["Reservas", "p"])
+        segmentos = tuple((int(q), float(pr)) for q, pr in zip(reservas["Reservas"], reservas["p"]))
+        try:
+            with etapa("aba1.segmentos"):
+                curva_seg = curva_risco_segmentos(capacidade, segmentos, p_extra)
+                limite_seg = limite_vendas_segmentos(capacidade, segmentos, p_extra, risco_maximo)
+                lucro_seg = curva_lucro_segmentos(capacidade, segmentos, p_extra, receita_passagem,
+                                                  custo_indenizacao)
+        except ValueError as erro:
+            st.error(str(erro))
+        else:
+            st.write(f"Risco de overbooking com as {curva_seg.vendas[0]} reservas atuais: "
+                     f"**{curva_seg.riscos[0] * 100:.2f}%**")
+            st.success(f"Máximo de passagens com risco ≤ {risco_maximo}%: {limite_seg}")
+            st.write(f"Excesso que maximiza o lucro esperado: **{lucro_seg.excesso_otimo}** passagens extras "
+                     f"(custo esperado com preteridos: R$ {lucro_seg.custos[lucro_seg.excesso_otimo]:,.2f})")
+            st.plotly_chart(figura_risco(curva_seg.vendas, curva_seg.riscos, risco_maximo),
+                            use_container_width=True)
+
+    # Otimização em lote
+    with st.expander("Otimização em lote para a frota (CSV/Parquet)"):
+        st.markdown(f"Colunas obrigatórias: `{'`, `'.join(COLUNAS_OBRIGATORIAS)}`. "
+                    "Opcionais: `risco_maximo` (%) e `vendidas`. Sem `risco_maximo`, usa o limite definido acima.")
+        arquivo_voos = st.file_uploader("Tabela de voos", type=["csv", "parquet"])
+        if arquivo_voos is not None:
+            try:
+                resultado_frota = otimizar_frota(arquivo_voos.getvalue(), arquivo_voos.name, risco_maximo)
+            except ValueError as erro:
+                st.error(str(erro))
+            else:
+                st.write(f"{len(resultado_frota)} voos — lucro extra esperado total: "
+                         f"**R$ {resultado_frota['lucro_extra_esperado'].sum():,.2f}**")
+                invalidos = int(resultado_frota["erro"].notna().sum())
+                if invalidos:
+                    st.warning(f"{invalidos} voo(s) inválido(s) ficaram sem cálculo; o motivo está na coluna `erro`.")
+                st.dataframe(resultado_frota.head(1000))
+                st.download_button("Baixar resultado (CSV)", resultado_frota.to_csv(index=False).encode("utf-8"),
+                                   file_name="overbooking_frota.csv", mime="text/csv")
+
 
 # -------------------------- ABA 2 - ROI DO NOVO SISTEMA --------------------------
-with aba2:
+@fragmento("aba2")
+def aba_roi():
     st.header("Análise de ROI do Novo Sistema de Previsão de Demanda")
 
     investimento = st.slider("Investimento inicial (R$)", min_value=10000, max_value=100000, value=50000, step=1000)
     receita_estimada = st.slider("Receita estimada com o novo sistema (R$)", min_value=40000, max_value=100000, value=80000, step=1000)
     custo_operacional = st.slider("Custo operacional anual (R$)", min_value=0, max_value=50000, value=10000, step=1000)
 
-    lucro = receita_estimada - custo_operacional
-    roi = (lucro / investimento) * 100
-    st.session_state["roi_percent"] = roi  # Salva o ROI para ser acessado na aba 3
+    roi = calcular_roi(investimento, receita_estimada, custo_operacional)
+    publicar("roi_percent", roi)  # Salva o ROI para ser acessado na aba 3
+    publicar("parametros_roi", (investimento, receita_estimada, custo_operacional))  # Base da sensibilidade
 
     st.write(f"### ROI Esperado: **{roi:.2f}%**")
 
@@ -123,25 +283,170 @@ with aba2:
     desvio = st.slider("Desvio padrão da receita simulada", min_value=1000, max_value=30000, value=10000, step=1000)
     simulacoes = st.slider("Número de simulações Monte Carlo", min_value=100, max_value=10000, value=1000, step=100)
     receita_limite = st.number_input("Defina um limite mínimo de receita para análise de risco (R$)", value=60000)
+    semente = st.number_input("Semente aleatória (mesma semente, mesmos cenários)", min_value=0, value=42, step=1)
 
-    receitas_simuladas = np.random.normal(loc=media, scale=desvio, size=simulacoes)
-    lucros_simulados = receitas_simuladas - custo_operacional
-    rois_simulados = (lucros_simulados / investimento) * 100
-
-    prob_receita_baixa = (receitas_simuladas < receita_limite).mean() * 100
-    st.write(f"Probabilidade da receita ficar abaixo de R$ {receita_limite:,.2f}: **{prob_receita_baixa:.2f}%**")
+    simulacao = simular_roi_cacheado(investimento, media, desvio, custo_operacional, simulacoes, receita_limite,
+                                     int(semente), 1)
+    st.write(f"Probabilidade da receita ficar abaixo de R$ {receita_limite:,.2f}: **{simulacao.prob_receita_baixa:.2f}%**")
 
-    fig = px.histogram(rois_simulados, nbins=30, title="Distribuição do ROI Simulado", labels={"value": "ROI (%)"})
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(montar_figura_roi(investimento, media, desvio, custo_operacional, simulacoes,
+                                      receita_limite, int(semente)), use_container_width=True)
 
     st.write("#### ROI em 3 cenários")
-    st.write(f"- Otimista (percentil 90): {np.percentile(rois_simulados, 90):.2f}%")
-    st.write(f"- Realista (média): {np.mean(rois_simulados):.2f}%")
-    st.write(f"- Pessimista (percentil 10): {np.percentile(rois_simulados, 10):.2f}%")
+    st.write(f"- Otimista (percentil 90): {simulacao.otimista:.2f}%")
+    st.write(f"- Realista (média): {simulacao.realista:.2f}%")
+    st.write(f"- Pessimista (percentil 10): {simulacao.pessimista:.2f}%")
+
+    # Parâmetros da estimativa de cauda, que roda em segundo plano (painel_cauda)
+    publicar("parametros_cauda", (investimento, media, desvio, custo_operacional, receita_limite, int(semente)))
+
+    st.markdown("#### Simulação Plurianual do Fluxo de Caixa (VPL, TIR e Payback)")
+    with st.expander("Parâmetros da simulação plurianual", expanded=False):
+        col_a, col_b, col_c = st.columns(3)
+        anos = col_a.slider("Horizonte (anos)", min_value=1, max_value=15, value=5)
+        taxa_desconto = col_a.slider("Taxa de desconto anual (%)", min_value=0.0, max_value=30.0, value=10.0, step=0.5)
+        crescimento_receita = col_b.slider("Crescimento anual da receita (%)", min_value=-10.0, max_value=20.0,
+                                           value=3.0, step=0.5)
+        crescimento_custo = col_b.slider("Crescimento anual do custo (%)", min_value=-10.0, max_value=20.0,
+                                         value=4.0, step=0.5)
+        volatilidade_receita = col_c.slider("Volatilidade anual da receita (%)", min_value=0.0, max_value=50.0,
+                                            value=min(round(desvio / media * 200) / 2, 50.0), step=0.5)
+        volatilidade_custo = col_c.slider("Volatilidade anual do custo (%)", min_value=0.0, max_value=50.0,
+                                          value=5.0, step=0.5)
+        correlacao = st.slider("Correlação entre choques de receita e custo", min_value=-1.0, max_value=1.0,
+                               value=0.3, step=0.05)
+        simulacoes_fluxo = st.select_slider("Cenários", options=[10**4, 10**5, 10**6], value=10**5,
+                                            format_func=lambda n: f"{n:,}".replace(",", "."))
+        usar_na_decisao = st.checkbox("Usar a distribuição do ROI médio anual na decisão (aba 3)")
+
+    parametros_fluxo = dict(
+        investimento=investimento, receita=media, custo_operacional=custo_operacional, anos=anos,
+        crescimento_receita=crescimento_receita / 100, crescimento_custo=crescimento_custo / 100,
+        volatilidade_receita=volatilidade_receita / 100, volatilidade_custo=volatilidade_custo / 100,
+        correlacao=correlacao, taxa_desconto=taxa_desconto / 100, simulacoes=simulacoes_fluxo,
+        semente=int(semente), trabalhadores=trabalhadores_padrao())  # até 10^5 é um bloco só, no próprio processo
+    with etapa("aba2.fluxo_caixa"):
+        fluxo = simular_fluxo_caixa(**parametros_fluxo)
+    publicar("fluxo_parametros", parametros_fluxo if usar_na_decisao else None)
+
+    col_vpl, col_tir, col_payback = st.columns(3)
+    vpl_p10, vpl_p50, vpl_p90 = fluxo.percentis("vpl")
+    tir_p10, tir_p50, tir_p90 = fluxo.percentis("tir") * 100
+    payback_p10, payback_p50, payback_p90 = fluxo.percentis("payback")
+    col_vpl.metric("VPL mediano", f"R$ {vpl_p50:,.0f}", f"P(VPL > 0) = {fluxo.prob_vpl_positivo:.1%}",
+                   delta_color="off")
+    col_tir.metric("TIR mediana", f"{tir_p50:.1f}%", f"P10–P90: {tir_p10:.1f}% a {tir_p90:.1f}%", delta_color="off")
+    payback_mediano = f"{payback_p50:.1f} anos" if np.isfinite(payback_p50) else "não recupera"
+    col_payback.metric("Payback mediano", payback_mediano,
+                       f"P(recuperar em {anos} anos) = {fluxo.prob_payback:.1%}", delta_color="off")
+    contagens, bordas = fluxo.histograma_vpl
+    st.plotly_chart(figura_histograma(bordas, contagens, "Distribuição do VPL", "VPL (R$)"),
+                    use_container_width=True)
+
+
+# Intervalo entre atualizações do progresso enquanto a simulação roda (s)
+INTERVALO_PROGRESSO = 0.5
+# Sem consultas ao progresso por esse tempo (sessão encerrada, aba fechada),
+# a simulação de cauda se cancela sozinha (s)
+ABANDONO_CAUDA = 30
+
+
+def cauda_em_andamento():
+    _, trabalho = st.session_state.get("trabalho_cauda", (None, None))
+    return trabalho is not None and not trabalho.concluido
+
+
+def painel_cauda(acompanhando):
+    """Estimativa de cauda em segundo plano.
+
+    É um fragmento criado a cada execução completa da página (ver o fim do
+    arquivo): com ``acompanhando``, o Streamlit o reexecuta sozinho a cada
+    ``INTERVALO_PROGRESSO`` para mostrar o progresso. Iniciar ou terminar uma
+    simulação reexecuta a página para ligar ou desligar esse intervalo.
+    """
+    investimento, media, desvio, custo_operacional, receita_limite, semente = st.session_state["parametros_cauda"]
+
+    st.markdown("#### Estimativa de Cauda com Muitos Cenários (em segundo plano)")
+    col_sim, col_proc = st.columns(2)
+    simulacoes_cauda = col_sim.select_slider("Número de simulações", options=[10**5, 10**6, 10**7, 10**8],
+                                             value=10**6, format_func=lambda n: f"{n:,}".replace(",", "."))
+    trabalhadores = col_proc.number_input("Processos", min_value=1, max_value=trabalhadores_padrao(),
+                                          value=trabalhadores_padrao())
+    chave = (investimento, media, desvio, custo_operacional, receita_limite, semente, simulacoes_cauda,
+             int(trabalhadores))
+
+    # Entradas mudaram: a simulação em andamento não serve mais
+    chave_anterior, trabalho = st.session_state.get("trabalho_cauda", (None, None))
+    if trabalho is not None and chave_anterior != chave:
+        trabalho.cancelar()
+        del st.session_state["trabalho_cauda"]
+        trabalho = None
+
+    col_iniciar, col_cancelar = st.columns(2)
+    em_andamento = trabalho is not None and not trabalho.concluido
+    if col_iniciar.button("Simular cauda", disabled=em_andamento):
+        trabalho = iniciar_simulacao_roi(investimento, media, desvio, custo_operacional, simulacoes_cauda,
+                                         receita_limite, semente=semente, trabalhadores=int(trabalhadores),
+                                         abandono=ABANDONO_CAUDA)
+        st.session_state["trabalho_cauda"] = (chave, trabalho)
+        st.rerun(scope="app")
+    if col_cancelar.button("Cancelar", disabled=not em_andamento):
+        trabalho.cancelar()
+    if acompanhando and (trabalho is None or trabalho.concluido):
+        st.rerun(scope="app")  # desliga a atualização periódica
+    if trabalho is None:
+        return
+
+    if trabalho.erro is not None:
+        st.error(f"A simulação falhou: {trabalho.erro}")
+        return
+    situacao = "cancelada" if trabalho.cancelado else "concluída" if trabalho.concluido else "em andamento"
+    st.progress(trabalho.progresso, text=f"{trabalho.feitos:,} de {trabalho.total:,} cenários ({situacao})")
+    resumo = trabalho.parcial()
+    if resumo is not None:
+        st.write(f"- Probabilidade da receita abaixo do limite: **{resumo.prob_receita_baixa:.4f}%**")
+        st.write(f"- Média do ROI: {resumo.realista:.2f}% (desvio {resumo.desvio:.2f} p.p.)")
+        st.write(f"- Percentis 1 / 10 / 90 / 99: {resumo.percentil(1):.2f}% / {resumo.pessimista:.2f}% / "
+                 f"{resumo.otimista:.2f}% / {resumo.percentil(99):.2f}%")
+        bordas, contagens = resumo.histograma.reagrupar(60, resumo.minimo, resumo.maximo)
+        st.plotly_chart(figura_histograma(bordas, contagens, f"ROI em {resumo.simulacoes:,} cenários", "ROI (%)"),
+                        use_container_width=True)
 
 
 # -------------------------- ABA 3 - DECISÃO FINAL --------------------------
-with aba3:
+ROTULOS_VARIAVEIS = {"investimento": "Investimento (R$)", "receita": "Receita (R$)",
+                     "custo_operacional": "Custo operacional (R$)", "roi_esperado": "ROI esperado (%)"}
+# Limites da grade de sensibilidade: os mesmos dos sliders das abas 2 e 3
+FAIXAS_GRADE = {"investimento": (10000, 100000), "receita": (40000, 100000),
+                "custo_operacional": (0, 50000), "roi_esperado": (50.0, 300.0)}
+
+
+def analise_sensibilidade(investimento, receita, custo_operacional, roi_esperado):
+    base = dict(zip(VARIAVEIS, (investimento, receita, custo_operacional, roi_esperado)))
+    variacao = st.slider("Variação de cada entrada no tornado (±%)", min_value=5, max_value=50, value=20, step=5)
+    with etapa("aba3.sensibilidade"):
+        barras = tornado(investimento, receita, custo_operacional, roi_esperado, variacao / 100)
+        proporcao_base = float(proporcoes_roi(calcular_roi(investimento, receita, custo_operacional), roi_esperado))
+    st.plotly_chart(figura_tornado(barras, proporcao_base, ROTULOS_VARIAVEIS), use_container_width=True)
+    st.dataframe(pd.DataFrame([(ROTULOS_VARIAVEIS[b.variavel], b.faixa_baixa, b.faixa_alta) for b in barras],
+                              columns=["Variável", f"Faixa com -{variacao}%", f"Faixa com +{variacao}%"]),
+                 hide_index=True)
+
+    col_x, col_y = st.columns(2)
+    eixo_x = col_x.selectbox("Eixo horizontal", VARIAVEIS, index=1, format_func=ROTULOS_VARIAVEIS.get)
+    eixo_y = col_y.selectbox("Eixo vertical", [v for v in VARIAVEIS if v != eixo_x],
+                             format_func=ROTULOS_VARIAVEIS.get)
+    with etapa("aba3.grade"):
+        grade = grade_decisao(*(tuple(np.linspace(*FAIXAS_GRADE[nome], 41)) for nome in VARIAVEIS))
+        faixas = grade.fatia(eixo_x, eixo_y, base)
+    st.plotly_chart(figura_mapa_faixas(grade.eixos[eixo_x], grade.eixos[eixo_y], faixas, ORDEM_CRESCENTE,
+                                       ROTULOS_VARIAVEIS[eixo_x], ROTULOS_VARIAVEIS[eixo_y]),
+                    use_container_width=True)
+    st.caption("As demais variáveis ficam no ponto da grade mais próximo dos valores atuais.")
+
+
+@fragmento("aba3")
+def aba_decisao():
     st.header("Decisão Estratégica Final")
 
     roi_percent = st.session_state.get("roi_percent", None)
@@ -154,42 +459,85 @@ with aba3:
         st.markdown("### 🎯 Defina o ROI que você considera satisfatório para o investimento")
         roi_esperado = st.slider("ROI desejado (%)", min_value=50.0, max_value=300.0, value=100.0, step=0.5)
 
-        diferenca = roi_percent - roi_esperado
-        proporcao = diferenca / roi_esperado if roi_esperado != 0 else 0
-
-        # Comentários realistas e técnicos
-        if proporcao >= 0.5:
-            comentario = (
-                f"O ROI obtido ({roi_percent:.2f}%) está **muito acima** do ROI esperado ({roi_esperado:.2f}%).\n\n"
-                "💰 **Comentário Financeiro:** O sistema gerou resultados excepcionais, indicando excelente gestão de custos e alta eficiência na previsão de demanda. É recomendável reinvestir parte do lucro em expansão ou inovação tecnológica.\n\n"
-                "🧠 **Comentário Técnico:** A acurácia do modelo de previsão é elevada. Para evoluir ainda mais, pode-se incorporar dados externos como sazonalidade e eventos regionais, além de algoritmos de machine learning para ajustes dinâmicos."
-            )
-        elif proporcao >= 0.05:
-            comentario = (
-                f"O ROI obtido ({roi_percent:.2f}%) está **acima** do ROI esperado ({roi_esperado:.2f}%).\n\n"
-                "💰 **Comentário Financeiro:** O retorno é satisfatório e confirma a viabilidade do investimento. A recomendação é manter a estratégia atual e considerar margens de segurança para eventuais variações de mercado.\n\n"
-                "🧠 **Comentário Técnico:** Para maximizar resultados, é interessante realizar ajustes finos nas variáveis do sistema e promover atualizações periódicas com novos dados de comportamento de passageiros."
-            )
-        elif -0.05 <= proporcao < 0.05:
-            comentario = (
-                f"O ROI calculado ({roi_percent:.2f}%) está **próximo ou igual** ao ROI esperado ({roi_esperado:.2f}%).\n\n"
-                "💰 **Comentário Financeiro:** Embora o retorno seja coerente com o objetivo, ele é sensível a pequenas mudanças de mercado. Recomenda-se acompanhar de perto os custos operacionais e otimizar processos para ampliar a margem.\n\n"
-                "🧠 **Comentário Técnico:** O sistema é funcional, mas pode se beneficiar de melhorias em fontes de dados e algoritmos de previsão para aumentar a robustez frente a cenários inesperados."
-            )
-        elif -0.3 <= proporcao < -0.05:
-            comentario = (
-                f"O ROI calculado ({roi_percent:.2f}%) está **abaixo** do ROI esperado ({roi_esperado:.2f}%).\n\n"
-                "💰 **Comentário Financeiro:** Há risco de o investimento não alcançar o retorno planejado. Alternativas como renegociar o custo de implementação ou buscar subsídios podem ser consideradas.\n\n"
-                "🧠 **Comentário Técnico:** O sistema pode estar superestimando a demanda ou subestimando custos. Ajustar as premissas de simulação e incorporar mais variáveis exógenas pode corrigir essas distorções."
-            )
-        else:
-            comentario = (
-                f"O ROI calculado ({roi_percent:.2f}%) está **muito abaixo** do ROI esperado ({roi_esperado:.2f}%).\n\n"
-                "💰 **Comentário Financeiro:** Nesse cenário, o investimento não se justifica sem ajustes substanciais. É recomendado reavaliar a continuidade do projeto ou repensar a estratégia de adoção.\n\n"
-                "🧠 **Comentário Técnico:** Uma revisão completa do sistema é necessária. A integração de dados em tempo real, uso de IA preditiva e segmentação de passageiros podem ser caminhos para viabilizar resultados futuros melhores."
-            )
+        with etapa("aba3.decisao"):
+            decisao = classificar_decisao(roi_percent, roi_esperado)
+            parametros_fluxo = st.session_state.get("fluxo_parametros")
+            if parametros_fluxo is not None:
+                fluxo = simular_fluxo_caixa(**parametros_fluxo)
+                distribuicao = classificar_distribuicao(fluxo.amostra_quantis("roi_anual"), roi_esperado)
+                decisao = distribuicao.mediana
 
         # Exibição final
         st.markdown("---")
         st.subheader("📌 Análise Estratégica:")
-        st.info(comentario)
\ No newline at end of file
+        st.info(decisao.comentario)
+
+        if parametros_fluxo is not None:
+            st.markdown(f"**Simulação plurianual:** ROI médio anual mediano de {decisao.roi_percent:.2f}%; "
+                        f"probabilidade de atingir o ROI desejado: **{distribuicao.prob_atingir:.1%}**")
+            st.dataframe(pd.DataFrame({"Faixa": [nome for nome, _ in FAIXAS],
+                                       "Probabilidade (%)": [distribuicao.probabilidades[nome] * 100
+                                                             for nome, _ in FAIXAS]}),
+                         hide_index=True,
+                         column_config={"Probabilidade (%)": st.column_config.ProgressColumn(
+                             format="%.1f%%", min_value=0.0, max_value=100.0)})
+
+        parametros_roi = st.session_state.get("parametros_roi")
+        if parametros_roi is not None:
+            with st.expander("Análise de sensibilidade da decisão"):
+                analise_sensibilidade(*parametros_roi, roi_esperado)
+
+
+# ---------------------------------- PÁGINA ----------------------------------
+# A medição é finalizada mesmo se a execução for interrompida (erro ou
+# st.rerun), para não deixar o cProfile ativo na thread da sessão.
+medicao = iniciar_medicao(perfil=capturar_perfil)
+try:
+    logo_unb = carregar_logo()
+
+    # Cabeçalho com logotipo e título
+    col1, col2, col3 = st.columns([1, 6, 1])
+    with col1:
+        st.image(logo_unb, use_container_width=True)
+    with col2:
+        st.markdown("<h1 style='text-align: center; color: #003366;'>Análise de Distribuições de Probabilidade</h1>", unsafe_allow_html=True)
+        st.markdown("<h3 style='text-align: center; color: #003366;'>Pedro Richetti Russo e Daniel Vianna</h3>", unsafe_allow_html=True)
+    with col3:
+        st.image(logo_unb, use_container_width=True)
+
+    st.markdown("---")
+
+    # Abas
+    aba1, aba2, aba3 = st.tabs(["Overbooking", "Simulação de ROI", "Decisão e Análise Final"])
+    with aba1:
+        aba_overbooking()
+    with aba2:
+        aba_roi()
+        acompanhando = cauda_em_andamento()
+        fragmento("aba2.cauda", run_every=INTERVALO_PROGRESSO if acompanhando else None)(painel_cauda)(acompanhando)
+    with aba3:
+        aba_decisao()
+finally:
+    medicao.finalizar()
+    if ARQUIVO_LOG_TEMPOS:
+        medicao.gravar_jsonl(ARQUIVO_LOG_TEMPOS)
+
+
+# -------------------------- PAINEL DE DESEMPENHO --------------------------
+if mostrar_tempos:
+    with st.sidebar:
+        st.write(f"Execução: **{medicao.total * 1000:.1f} ms** "
+                 f"(widgets e renderização: {(medicao.total - medicao.tempo_etapas) * 1000:.1f} ms)")
+        st.dataframe(pd.DataFrame([("   " * (e.nivel - 1) + "↳ " * (e.nivel > 0) + e.nome, e.segundos * 1000) for e in medicao.etapas],
+                                  columns=["Etapa", "ms"]).round(3), hide_index=True)
+        st.caption("Etapas com ↳ estão contidas na etapa acima delas e não entram na soma.")
+        if medicao.caches_pagina:
+            st.write("Caches do painel (acertos / faltas desta sessão nesta execução)")
+            st.dataframe(pd.DataFrame.from_dict(medicao.caches_pagina, orient="index"))
+        if medicao.caches:
+            st.write("Caches do motor (acertos / faltas no processo durante esta execução, "
+                     "incluindo outras sessões simultâneas)")
+            st.dataframe(pd.DataFrame.from_dict(medicao.caches, orient="index"))
+        relatorio = medicao.relatorio_perfil()
+        if relatorio:
+            st.code(relatorio, language="text")
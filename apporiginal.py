@@ -8,6 +8,8 @@ import pandas as pd
 from PIL import Image
 import subprocess
 import warnings
+
+from motor.montecarlo import simular_conversoes
 warnings.filterwarnings("ignore")
 
 # Configuração da página
@@ -239,8 +241,8 @@ with tab4:
     sims = st.slider("Número de simulações Monte Carlo", min_value=100, max_value=5000, value=1000, step=100)
 
     # Simulação Monte Carlo
-    sim_conversions = [np.sum(np.random.binomial(n, p, size=employees)) for _ in range(sims)]
-    sim_profits = np.array(sim_conversions) * revenue - employees * wage
+    sim_conversions = simular_conversoes(n, p, employees, sims, semente=42)
+    sim_profits = sim_conversions * revenue - employees * wage
 
     # Gráfico interativo com Plotly
     fig = go.Figure()
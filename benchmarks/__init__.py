@@ -0,0 +1 @@
+"""Benchmarks do motor; execute com ``python -m benchmarks``."""
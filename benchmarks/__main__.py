@@ -0,0 +1,113 @@
+"""Executa os benchmarks e compara com a linha de base gravada no repositório.
+
+Uso::
+
+    python -m benchmarks                  # casos rápidos, compara com baseline.json
+    python -m benchmarks --completo       # inclui 10^7–10^8 sorteios e frotas grandes
+    python -m benchmarks --salvar         # grava os tempos medidos como nova linha de base
+    python -m benchmarks -k simular_roi   # só casos cujo nome contém o texto
+
+O tempo de cada caso é a mediana das repetições, cada uma com pelo menos
+``--tempo-minimo`` segundos, e o ruído é a dispersão relativa entre elas
+(intervalo interquartil / mediana). Um caso é regressão quando fica mais
+lento que a linha de base além de ``--tolerancia`` somada ao ruído das duas
+medições; nesse caso o comando termina com código 1. Casos paralelos só são
+medidos com mais de uma CPU e só são comparados com uma linha de base
+gravada com o mesmo número de CPUs.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+from benchmarks.casos import CASOS
+
+LINHA_DE_BASE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def medir(chamada, repeticoes: int, tempo_minimo: float = 0.5) -> tuple:
+    """``(mediana, ruído)``: tempo por chamada em segundos e dispersão relativa entre as rodadas."""
+    temporizador = timeit.Timer(chamada)
+    numero, total = temporizador.autorange()
+    if total < tempo_minimo and numero > 0:
+        numero = max(1, int(numero * tempo_minimo / max(total, 1e-9)))
+    tempos = [tempo / numero for tempo in temporizador.repeat(repeat=repeticoes, number=numero)]
+    mediana = statistics.median(tempos)
+    if len(tempos) < 4:
+        return mediana, 0.0
+    quartis = statistics.quantiles(tempos, n=4)
+    return mediana, (quartis[2] - quartis[0]) / mediana
+
+
+def _carregar_linha_de_base(caminho):
+    """``(máquina, casos)``; cada caso é ``{"tempo": s, "ruido": fração}`` (ou só o tempo, nas antigas)."""
+    if not os.path.exists(caminho):
+        return {}, {}
+    with open(caminho, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    casos = {nome: valor if isinstance(valor, dict) else {"tempo": valor, "ruido": 0.0}
+             for nome, valor in dados.get("casos", {}).items()}
+    return dados.get("maquina", {}), casos
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do motor de overbooking e ROI.")
+    parser.add_argument("--completo", action="store_true", help="inclui os casos de grande escala")
+    parser.add_argument("-k", dest="filtro", default="", help="só casos cujo nome contém o texto")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tempo-minimo", type=float, default=0.5,
+                        help="segundos mínimos de cada repetição (padrão 0.5)")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="fração de lentidão aceita, além do ruído, antes de acusar regressão (padrão 0.25)")
+    parser.add_argument("--linha-de-base", default=LINHA_DE_BASE)
+    parser.add_argument("--salvar", action="store_true", help="grava os resultados como linha de base")
+    args = parser.parse_args(argv)
+
+    maquina_base, base = _carregar_linha_de_base(args.linha_de_base)
+    cpus = os.cpu_count() or 1
+    medidos = {}
+    pulados = set()
+    regressoes = []
+    for nome, (preparar, completo, paralelo) in CASOS.items():
+        if (completo and not args.completo) or args.filtro not in nome:
+            continue
+        if paralelo and cpus == 1:  # seria a versão serial com o custo extra do pool
+            pulados.add(nome)
+            print(f"{nome:36s} {'-':>12s}      pulado (1 CPU)")
+            continue
+        tempo, ruido = medir(preparar(), 1 if completo else args.repeticoes, args.tempo_minimo)
+        medidos[nome] = {"tempo": tempo, "ruido": ruido}
+        referencia = base.get(nome)
+        if referencia is None:
+            situacao = "sem base"
+        elif paralelo and maquina_base.get("cpus") != cpus:
+            situacao = f"não comparável (base com {maquina_base.get('cpus')} CPUs)"
+        else:
+            razao = tempo / referencia["tempo"]
+            situacao = f"{razao:5.2f}x"
+            if razao > 1 + args.tolerancia + ruido + referencia["ruido"]:
+                situacao += "  REGRESSÃO"
+                regressoes.append(nome)
+        print(f"{nome:36s} {tempo * 1e3:12.3f} ms ±{ruido:4.0%}   {situacao}")
+
+    if args.salvar:
+        dados = {"maquina": {"python": platform.python_version(), "plataforma": platform.platform(),
+                             "processador": platform.processor(), "cpus": cpus},
+                 "casos": {**{n: c for n, c in base.items() if n not in pulados}, **medidos}}
+        with open(args.linha_de_base, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, indent=2, sort_keys=True)
+            arquivo.write("\n")
+        print(f"Linha de base gravada em {args.linha_de_base}")
+
+    if regressoes:
+        print(f"{len(regressoes)} regressão(ões): {', '.join(regressoes)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
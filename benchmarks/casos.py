@@ -0,0 +1,115 @@
+"""Casos de benchmark dos caminhos quentes do painel.
+
+Cada caso é uma função que prepara os dados e devolve a chamada a ser
+cronometrada. As funções memoizadas do motor são medidas pelo
+``__wrapped__``, sem o cache, para refletir o custo de um parâmetro novo.
+Casos marcados como ``completo`` (10^7–10^8 sorteios, frotas grandes) só
+rodam com ``--completo``; os marcados como ``paralelo`` dependem do número de
+CPUs e só são comparados com uma linha de base da mesma máquina.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from motor import curva_lucro, curva_risco, limite_vendas, simular_conversoes, simular_roi
+from motor.lote import otimizar_tabela
+
+CASOS = {}
+
+
+def caso(nome: str, completo: bool = False, paralelo: bool = False):
+    def registrar(preparar):
+        CASOS[nome] = (preparar, completo, paralelo)
+        return preparar
+    return registrar
+
+
+def _registrar_escalas(prefixo, escalas, completo_a_partir=None, paralelo=False):
+    """Registra ``prefixo[escala]`` para cada escala, via uma fábrica ``preparar(escala)``."""
+    def registrar(fabrica):
+        for escala in escalas:
+            completo = completo_a_partir is not None and escala >= completo_a_partir
+            CASOS[f"{prefixo}[{escala}]"] = (lambda escala=escala: fabrica(escala), completo, paralelo)
+        return fabrica
+    return registrar
+
+
+# ------------------------------- Overbooking -------------------------------
+
+@_registrar_escalas("curva_risco", (100, 200, 500))
+def _curva_risco(capacidade):
+    return lambda: curva_risco.__wrapped__(capacidade, 0.88)
+
+
+@_registrar_escalas("limite_vendas", (100, 200, 500))
+def _limite_vendas(capacidade):
+    return lambda: limite_vendas.__wrapped__(capacidade, 0.88, 7)
+
+
+@_registrar_escalas("curva_lucro", (100, 200, 500))
+def _curva_lucro(capacidade):
+    return lambda: curva_lucro.__wrapped__(capacidade, 0.88, 500, 1000)
+
+
+@caso("tabela_riscos_pandas")
+def _tabela_riscos():
+    curva = curva_risco.__wrapped__(120, 0.88)
+    return lambda: pd.DataFrame({"Passagens Vendidas": curva.vendas,
+                                 "Risco de Overbooking (%)": (curva.riscos * 100).round(2)})
+
+
+@_registrar_escalas("otimizar_tabela", (10_000, 100_000), completo_a_partir=100_000)
+def _otimizar_tabela(voos):
+    gerador = np.random.default_rng(0)
+    tabela = pd.DataFrame({
+        "capacidade": gerador.integers(100, 501, voos),
+        "p": gerador.uniform(0.80, 0.99, voos).round(2),
+        "receita_passagem": 500.0,
+        "custo_indenizacao": 1000.0,
+    })
+    return lambda: otimizar_tabela(tabela, 7)
+
+
+# ------------------------------- Monte Carlo -------------------------------
+
+@_registrar_escalas("simular_roi", (10**3, 10**5, 10**6, 10**7, 10**8), completo_a_partir=10**7)
+def _simular_roi(simulacoes):
+    return lambda: simular_roi(50000, 80000, 10000, 10000, simulacoes, 60000, semente=42)
+
+
+@_registrar_escalas("simular_roi_paralelo", (10**7, 10**8), completo_a_partir=10**7, paralelo=True)
+def _simular_roi_paralelo(simulacoes):
+    trabalhadores = os.cpu_count() or 1
+    return lambda: simular_roi(50000, 80000, 10000, 10000, simulacoes, 60000, semente=42,
+                               trabalhadores=trabalhadores)
+
+
+@_registrar_escalas("simular_conversoes", (10**3, 10**5))
+def _simular_conversoes(simulacoes):
+    return lambda: simular_conversoes(50, 0.04, 100, simulacoes, semente=42)
+
+
+# --------------------------------- Figuras ---------------------------------
+
+@caso("figura_risco")
+def _figura_risco():
+    from graficos import figura_risco
+    curva = curva_risco.__wrapped__(120, 0.88)
+    return lambda: figura_risco(curva.vendas, curva.riscos, 7)
+
+
+@caso("figura_histograma_roi")
+def _figura_histograma():
+    from graficos import figura_histograma
+    simulacao = simular_roi(50000, 80000, 10000, 10000, 10**5, 60000, semente=42)
+    bordas, contagens = simulacao.histograma.reagrupar(30, simulacao.minimo, simulacao.maximo)
+    return lambda: figura_histograma(bordas, contagens, "ROI", "ROI (%)")
+
+
+@caso("carregar_logo")
+def _carregar_logo():
+    from PIL import Image
+    caminho = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Logo", "unb_logo.png")
+    return lambda: Image.open(caminho).load()
@@ -0,0 +1,111 @@
+"""Construção das figuras Plotly do painel.
+
+As figuras recebem dados já agregados: curvas longas são reduzidas a no
+máximo ``MAX_PONTOS`` pontos e distribuições chegam como contagens por
+faixa (``go.Bar``), nunca como amostras. Assim o JSON enviado ao navegador
+tem tamanho limitado, qualquer que seja o número de simulações.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+MAX_PONTOS = 500
+AZUL = '#003366'
+# Faixas de decisão, de "muito_abaixo" a "muito_acima"
+CORES_FAIXAS = ('#b71c1c', '#ef6c00', '#fdd835', '#7cb342', '#2e7d32')
+
+
+def reduzir_pontos(x, y, maximo: int = MAX_PONTOS):
+    """Reduz uma curva a cerca de ``maximo`` pontos preservando picos e vales.
+
+    Divide a curva em ``maximo // 2`` grupos e mantém, em ordem, o mínimo e o
+    máximo de cada grupo (além das extremidades). Curvas curtas voltam intactas.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x.size <= maximo:
+        return x, y
+    grupos = np.array_split(np.arange(x.size), max(maximo // 2, 1))
+    indices = {0, x.size - 1}
+    for grupo in grupos:
+        trecho = y[grupo]
+        indices.update((grupo[np.argmin(trecho)], grupo[np.argmax(trecho)]))
+    indices = np.fromiter(sorted(indices), dtype=np.int64)
+    return x[indices], y[indices]
+
+
+def figura_risco(vendas, riscos, risco_maximo) -> go.Figure:
+    x, y = reduzir_pontos(vendas, riscos)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines+markers', line=dict(color=AZUL)))
+
+    # Linha horizontal indicando o limite de risco no eixo Y
+    fig.add_hline(y=risco_maximo / 100, line=dict(color='red', width=2, dash='dash'),
+                  annotation_text=f"Limite {risco_maximo}%", annotation_position="bottom right")
+
+    fig.update_layout(title="Probabilidade de Overbooking (mais passageiros que assentos)",
+                      xaxis_title="Número de Passagens Vendidas",
+                      yaxis_title="Probabilidade (%)",
+                      yaxis=dict(range=[0, 1]),
+                      plot_bgcolor="white")
+    return fig
+
+
+def figura_lucro(excessos, lucros, custos, excesso_otimo, excesso) -> go.Figure:
+    x, y = reduzir_pontos(excessos, lucros)
+    x_custo, y_custo = reduzir_pontos(excessos, custos)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines+markers', name="Lucro esperado", line=dict(color=AZUL)))
+    fig.add_trace(go.Scatter(x=x_custo, y=y_custo, mode='lines', name="Custo esperado",
+                             line=dict(color='red', dash='dot')))
+    fig.add_vline(x=excesso_otimo, line=dict(color='#4CAF50', width=2, dash='dash'),
+                  annotation_text=f"Ótimo: +{excesso_otimo}", annotation_position="top left")
+    fig.add_vline(x=excesso, line=dict(color='gray', width=1))
+
+    fig.update_layout(title="Lucro Esperado por Passagens Vendidas Acima da Capacidade",
+                      xaxis_title="Passagens acima da capacidade",
+                      yaxis_title="R$",
+                      plot_bgcolor="white")
+    return fig
+
+
+def figura_histograma(bordas, contagens, titulo: str, eixo_x: str) -> go.Figure:
+    """Histograma a partir de contagens já agrupadas (``len(bordas) == len(contagens) + 1``)."""
+    bordas = np.asarray(bordas, dtype=float)
+    fig = go.Figure(go.Bar(x=(bordas[:-1] + bordas[1:]) / 2, y=np.asarray(contagens),
+                           width=np.diff(bordas), marker_color=AZUL))
+    fig.update_layout(title=titulo, xaxis_title=eixo_x, yaxis_title="Frequência",
+                      bargap=0, plot_bgcolor="white")
+    return fig
+
+
+def figura_tornado(barras, proporcao_base: float, rotulos: dict) -> go.Figure:
+    """Tornado da proporção (ROI relativo ao esperado, em %) para cada variável.
+
+    ``barras`` são :class:`motor.sensibilidade.BarraTornado`, já ordenadas
+    da maior para a menor amplitude.
+    """
+    nomes = [rotulos.get(b.variavel, b.variavel) for b in reversed(barras)]
+    base = proporcao_base * 100
+    fig = go.Figure()
+    for atributo, nome, cor in (("proporcao_baixa", "-variação", '#ef6c00'), ("proporcao_alta", "+variação", AZUL)):
+        valores = np.array([getattr(b, atributo) * 100 for b in reversed(barras)])
+        fig.add_trace(go.Bar(y=nomes, x=valores - base, base=base, orientation='h', name=nome, marker_color=cor))
+    fig.add_vline(x=base, line=dict(color='gray', width=1))
+    fig.update_layout(title="Sensibilidade da diferença relativa ao ROI esperado",
+                      xaxis_title="Diferença relativa ao ROI esperado (%)", barmode='overlay',
+                      plot_bgcolor="white")
+    return fig
+
+
+def figura_mapa_faixas(x, y, faixas, nomes_faixas, eixo_x: str, eixo_y: str) -> go.Figure:
+    """Mapa de calor discreto das faixas de decisão (``faixas`` com forma ``len(y)`` × ``len(x)``)."""
+    n = len(nomes_faixas)
+    escala = []
+    for indice, cor in enumerate(CORES_FAIXAS[:n]):
+        escala += [(indice / n, cor), ((indice + 1) / n, cor)]
+    fig = go.Figure(go.Heatmap(
+        x=np.asarray(x), y=np.asarray(y), z=np.asarray(faixas), zmin=-0.5, zmax=n - 0.5, colorscale=escala,
+        colorbar=dict(tickvals=list(range(n)), ticktext=list(nomes_faixas))))
+    fig.update_layout(title="Faixa de decisão", xaxis_title=eixo_x, yaxis_title=eixo_y, plot_bgcolor="white")
+    return fig
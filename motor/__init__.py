@@ -0,0 +1,59 @@
+"""Motor de cálculo do painel de overbooking e ROI.
+
+Funções puras (sem Streamlit nem Plotly) usadas pelo ``app.py``; podem ser
+importadas diretamente em scripts, jobs em lote ou benchmarks.
+"""
+
+from motor.acumuladores import ContadorLimite, Histograma, MediaVariancia, Quantis
+from motor.cache import CacheLRU, EstatisticasCache, estatisticas_caches, limpar_caches, memoizar
+from motor.decisao import Decisao, DecisaoDistribuicao, classificar_decisao, classificar_distribuicao
+from motor.fluxo_caixa import SimulacaoFluxo, simular_fluxo_caixa
+from motor.montecarlo import amostras_em_blocos, fluxo, fluxos, simular_conversoes
+from motor.overbooking import (
+    CurvaLucro,
+    CurvaRisco,
+    curva_lucro,
+    curva_risco,
+    limite_vendas,
+    preteridos_esperados,
+    risco_overbooking,
+)
+from motor.paralelo import executar_em_blocos
+from motor.roi import SimulacaoROI, calcular_roi, iniciar_simulacao_roi, simular_roi
+from motor.tarefas import Trabalho, submeter
+
+__all__ = [
+    "CacheLRU",
+    "ContadorLimite",
+    "CurvaLucro",
+    "CurvaRisco",
+    "Decisao",
+    "DecisaoDistribuicao",
+    "EstatisticasCache",
+    "Histograma",
+    "MediaVariancia",
+    "Quantis",
+    "SimulacaoFluxo",
+    "SimulacaoROI",
+    "Trabalho",
+    "amostras_em_blocos",
+    "calcular_roi",
+    "classificar_decisao",
+    "classificar_distribuicao",
+    "curva_lucro",
+    "curva_risco",
+    "estatisticas_caches",
+    "executar_em_blocos",
+    "fluxo",
+    "fluxos",
+    "iniciar_simulacao_roi",
+    "limite_vendas",
+    "limpar_caches",
+    "memoizar",
+    "preteridos_esperados",
+    "risco_overbooking",
+    "simular_conversoes",
+    "simular_fluxo_caixa",
+    "simular_roi",
+    "submeter",
+]
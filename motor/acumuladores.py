@@ -0,0 +1,227 @@
+"""Estatísticas incrementais e combináveis para simulações Monte Carlo.
+
+Os acumuladores recebem as amostras bloco a bloco (``adicionar``) e podem
+ser unidos (``combinar``), o que permite calcular média, variância e
+percentis de bilhões de sorteios distribuídos entre processos sem guardar
+as amostras. Combinando sempre na mesma ordem, o resultado é idêntico bit a
+bit qualquer que seja a divisão do trabalho.
+"""
+
+import math
+
+import numpy as np
+
+
+class MediaVariancia:
+    """Média, variância, mínimo e máximo (Welford por bloco, fórmula de Chan na união)."""
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def adicionar(self, valores) -> None:
+        valores = np.asarray(valores, dtype=float).ravel()
+        if not valores.size:
+            return
+        bloco = MediaVariancia()
+        bloco.n = valores.size
+        bloco.media = float(valores.mean())
+        bloco.m2 = float(np.square(valores - bloco.media).sum())
+        bloco.minimo = float(valores.min())
+        bloco.maximo = float(valores.max())
+        self.combinar(bloco)
+
+    def combinar(self, outro: "MediaVariancia") -> None:
+        if not outro.n:
+            return
+        n = self.n + outro.n
+        delta = outro.media - self.media
+        self.media += delta * outro.n / n
+        self.m2 += outro.m2 + delta * delta * self.n * outro.n / n
+        self.n = n
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+
+    @property
+    def variancia(self) -> float:
+        """Variância populacional (``ddof=0``, como ``np.var``)."""
+        return self.m2 / self.n if self.n else math.nan
+
+    @property
+    def desvio(self) -> float:
+        return math.sqrt(self.variancia)
+
+
+class ContadorLimite:
+    """Quantidade de valores abaixo de ``limite`` (ex.: receita mínima)."""
+
+    def __init__(self, limite: float):
+        self.limite = limite
+        self.n = 0
+        self.abaixo = 0
+
+    def adicionar(self, valores) -> None:
+        valores = np.asarray(valores).ravel()
+        self.n += valores.size
+        self.abaixo += int(np.count_nonzero(valores < self.limite))
+
+    def combinar(self, outro: "ContadorLimite") -> None:
+        self.n += outro.n
+        self.abaixo += outro.abaixo
+
+    @property
+    def proporcao(self) -> float:
+        return self.abaixo / self.n if self.n else math.nan
+
+
+class Histograma:
+    """Histograma de faixas fixas em ``[inicio, fim)``, com contagem de valores fora dela.
+
+    Serve de sketch de quantis: o erro de :meth:`percentil` é no máximo a
+    largura de uma faixa, desde que o percentil caia dentro do intervalo.
+    """
+
+    def __init__(self, inicio: float, fim: float, faixas: int = 2000):
+        if not fim > inicio or faixas <= 0:
+            raise ValueError("O histograma precisa de fim > inicio e faixas > 0.")
+        self.inicio = float(inicio)
+        self.fim = float(fim)
+        self.contagens = np.zeros(faixas, dtype=np.int64)
+        self.abaixo = 0
+        self.acima = 0
+
+    @property
+    def faixas(self) -> int:
+        return self.contagens.size
+
+    @property
+    def largura(self) -> float:
+        return (self.fim - self.inicio) / self.faixas
+
+    @property
+    def bordas(self) -> np.ndarray:
+        return np.linspace(self.inicio, self.fim, self.faixas + 1)
+
+    @property
+    def total(self) -> int:
+        return int(self.contagens.sum()) + self.abaixo + self.acima
+
+    def adicionar(self, valores) -> None:
+        valores = np.asarray(valores, dtype=float).ravel()
+        indices = np.floor((valores - self.inicio) / self.largura)
+        abaixo = indices < 0
+        acima = indices >= self.faixas
+        self.abaixo += int(abaixo.sum())
+        self.acima += int(acima.sum())
+        dentro = indices[~(abaixo | acima)].astype(np.int64)
+        self.contagens += np.bincount(dentro, minlength=self.faixas)
+
+    def combinar(self, outro: "Histograma") -> None:
+        if (outro.inicio, outro.fim, outro.faixas) != (self.inicio, self.fim, self.faixas):
+            raise ValueError("Só é possível combinar histogramas com as mesmas faixas.")
+        self.contagens += outro.contagens
+        self.abaixo += outro.abaixo
+        self.acima += outro.acima
+
+    def percentil(self, q: float) -> float:
+        """Percentil ``q`` (0–100) por interpolação linear dentro da faixa.
+
+        Percentis que caem fora do intervalo são limitados a ``inicio``/``fim``.
+        """
+        total = self.total
+        if not total:
+            return math.nan
+        alvo = q / 100 * total - self.abaixo
+        if alvo <= 0:
+            return self.inicio
+        acumulado = np.cumsum(self.contagens)
+        faixa = int(np.searchsorted(acumulado, alvo))
+        if faixa >= self.faixas:
+            return self.fim
+        antes = acumulado[faixa - 1] if faixa else 0
+        fracao = (alvo - antes) / self.contagens[faixa]
+        return self.inicio + (faixa + fracao) * self.largura
+
+    def reagrupar(self, faixas: int = 30, inicio: float = None, fim: float = None):
+        """Bordas e contagens com ``faixas`` faixas largas entre ``inicio`` e ``fim``.
+
+        As faixas finas, da que contém ``inicio`` até a que contém ``fim``
+        (padrão: o intervalo inteiro), são somadas em grupos sem voltar às
+        amostras. Retorna ``(bordas, contagens)``.
+        """
+        primeira = 0 if inicio is None else int(np.clip(
+            np.floor((inicio - self.inicio) / self.largura), 0, self.faixas - 1))
+        ultima = self.faixas if fim is None else int(np.clip(
+            np.floor((fim - self.inicio) / self.largura) + 1, primeira + 1, self.faixas))
+        finas = ultima - primeira
+        cortes = np.linspace(0, finas, min(faixas, finas) + 1).astype(np.int64)
+        contagens = np.add.reduceat(self.contagens[primeira:ultima], cortes[:-1])
+        bordas = self.inicio + (primeira + cortes) * self.largura
+        return bordas, contagens
+
+
+class Quantis:
+    """Sketch de quantis combinável, sem faixas fixas: serve quando o intervalo não é conhecido de antemão.
+
+    Cada bloco com mais de ``pontos`` amostras vira seus percentis
+    0, …, 100 em ``pontos`` passos (valores das próprias amostras, sem
+    interpolar), cada um com o peso das amostras que representa; blocos
+    menores são guardados inteiros. A união só concatena os pontos, então o
+    erro de :meth:`percentis` é de no máximo ``1 / (pontos - 1)`` na ordem
+    (0,1% com 1001 pontos), qualquer que seja o número de blocos, e com um
+    único bloco o resultado é exato. ``nan`` é ignorado; ``±inf`` é mantido.
+    """
+
+    def __init__(self, pontos: int = 1001):
+        if pontos < 2:
+            raise ValueError("O sketch precisa de pelo menos 2 pontos.")
+        self.pontos = pontos
+        self.n = 0
+        self.valores = np.empty(0)
+        self.pesos = np.empty(0)
+
+    def adicionar(self, valores) -> None:
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if not valores.size:
+            return
+        if valores.size <= self.pontos:
+            pontos, pesos = np.sort(valores), np.ones(valores.size)
+        else:
+            pontos = np.percentile(valores, np.linspace(0, 100, self.pontos), method="inverted_cdf")
+            # O ponto i representa as ordens entre (i ± 1/2) / (pontos - 1); os extremos, meia faixa
+            pesos = np.full(self.pontos, valores.size / (self.pontos - 1))
+            pesos[[0, -1]] /= 2
+        self.n += valores.size
+        self.valores = np.concatenate([self.valores, pontos])
+        self.pesos = np.concatenate([self.pesos, pesos])
+
+    def combinar(self, outro: "Quantis") -> None:
+        self.n += outro.n
+        self.valores = np.concatenate([self.valores, outro.valores])
+        self.pesos = np.concatenate([self.pesos, outro.pesos])
+
+    def _acumulado(self):
+        ordem = np.argsort(self.valores, kind="stable")
+        return self.valores[ordem], np.cumsum(self.pesos[ordem])
+
+    def percentis(self, qs) -> np.ndarray:
+        """Percentis ``qs`` (0–100): o menor ponto cuja ordem acumulada alcança ``q``."""
+        qs = np.asarray(qs, dtype=float)
+        if not self.n:
+            return np.full(qs.shape, math.nan)
+        valores, acumulado = self._acumulado()
+        alvos = qs / 100 * self.n - 1e-9 * self.n  # tolerância ao arredondamento da soma dos pesos
+        return valores[np.minimum(np.searchsorted(acumulado, alvos), valores.size - 1)]
+
+    def contagens(self, bordas) -> np.ndarray:
+        """Contagens aproximadas em cada faixa de ``bordas``, como ``np.histogram`` (última faixa fechada)."""
+        bordas = np.asarray(bordas, dtype=float)
+        valores, acumulado = self._acumulado()
+        acumulado = np.concatenate([[0.0], acumulado])
+        antes = acumulado[np.searchsorted(valores, bordas[:-1], side="left")]
+        ate_fim = acumulado[np.searchsorted(valores, bordas[-1], side="right")]
+        return np.diff(np.rint(np.append(antes, ate_fim))).astype(np.int64)
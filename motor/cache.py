@@ -0,0 +1,107 @@
+"""Cache LRU limitado e com estatísticas para as funções do motor.
+
+Diferente de ``functools.lru_cache``, permite redimensionar em tempo de
+execução e conta despejos (evictions), além de acertos e faltas. O tamanho
+padrão pode ser definido pela variável de ambiente ``MOTOR_CACHE_TAMANHO``.
+"""
+
+import functools
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+TAMANHO_PADRAO = int(os.environ.get("MOTOR_CACHE_TAMANHO", "256"))
+
+_caches = {}
+
+
+@dataclass(frozen=True)
+class EstatisticasCache:
+    nome: str
+    tamanho_maximo: int
+    itens: int
+    acertos: int
+    faltas: int
+    despejos: int
+
+    @property
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.faltas
+        return self.acertos / total if total else 0.0
+
+
+class CacheLRU:
+    """Mapa LRU thread-safe (o Streamlit atende sessões em threads distintas)."""
+
+    def __init__(self, nome: str, tamanho_maximo: int = TAMANHO_PADRAO):
+        self.nome = nome
+        self.tamanho_maximo = tamanho_maximo
+        self._dados = OrderedDict()
+        self._trava = threading.Lock()
+        self._acertos = self._faltas = self._despejos = 0
+
+    def obter(self, chave, calcular):
+        with self._trava:
+            if chave in self._dados:
+                self._dados.move_to_end(chave)
+                self._acertos += 1
+                return self._dados[chave]
+            self._faltas += 1
+        valor = calcular()
+        with self._trava:
+            self._dados[chave] = valor
+            self._dados.move_to_end(chave)
+            self._despejar()
+        return valor
+
+    def redimensionar(self, tamanho_maximo: int) -> None:
+        with self._trava:
+            self.tamanho_maximo = tamanho_maximo
+            self._despejar()
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._dados.clear()
+            self._acertos = self._faltas = self._despejos = 0
+
+    def estatisticas(self) -> EstatisticasCache:
+        with self._trava:
+            return EstatisticasCache(self.nome, self.tamanho_maximo, len(self._dados),
+                                     self._acertos, self._faltas, self._despejos)
+
+    def _despejar(self) -> None:
+        while len(self._dados) > max(self.tamanho_maximo, 0):
+            self._dados.popitem(last=False)
+            self._despejos += 1
+
+
+def memoizar(tamanho_maximo: int = TAMANHO_PADRAO):
+    """Decorador que memoiza uma função de argumentos hasheáveis.
+
+    O cache fica acessível em ``funcao.cache`` e é registrado em
+    :func:`estatisticas_caches`. Resultados são compartilhados entre
+    chamadas: arrays devolvidos devem ser tratados como somente leitura.
+    """
+    def decorador(funcao):
+        cache = CacheLRU(funcao.__qualname__, tamanho_maximo)
+        _caches[cache.nome] = cache
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            chave = (args, tuple(sorted(kwargs.items())))
+            return cache.obter(chave, lambda: funcao(*args, **kwargs))
+
+        envoltorio.cache = cache
+        return envoltorio
+    return decorador
+
+
+def estatisticas_caches() -> list:
+    """Estatísticas de todos os caches do motor."""
+    return [cache.estatisticas() for cache in _caches.values()]
+
+
+def limpar_caches() -> None:
+    for cache in _caches.values():
+        cache.limpar()
@@ -0,0 +1,106 @@
+"""Classificação do ROI obtido frente ao ROI esperado (aba 3)."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Faixas em ordem decrescente: (nome, limite inferior da proporção).
+FAIXAS = (
+    ("muito_acima", 0.5),
+    ("acima", 0.05),
+    ("proximo", -0.05),
+    ("abaixo", -0.3),
+    ("muito_abaixo", float("-inf")),
+)
+
+# Mesmas faixas em ordem crescente, como índices de :func:`indices_faixas`
+ORDEM_CRESCENTE = tuple(nome for nome, _ in reversed(FAIXAS))
+
+COMENTARIOS = {
+    "muito_acima": (
+        "O ROI obtido ({roi:.2f}%) está **muito acima** do ROI esperado ({esperado:.2f}%).\n\n"
+        "💰 **Comentário Financeiro:** O sistema gerou resultados excepcionais, indicando excelente gestão de custos e alta eficiência na previsão de demanda. É recomendável reinvestir parte do lucro em expansão ou inovação tecnológica.\n\n"
+        "🧠 **Comentário Técnico:** A acurácia do modelo de previsão é elevada. Para evoluir ainda mais, pode-se incorporar dados externos como sazonalidade e eventos regionais, além de algoritmos de machine learning para ajustes dinâmicos."
+    ),
+    "acima": (
+        "O ROI obtido ({roi:.2f}%) está **acima** do ROI esperado ({esperado:.2f}%).\n\n"
+        "💰 **Comentário Financeiro:** O retorno é satisfatório e confirma a viabilidade do investimento. A recomendação é manter a estratégia atual e considerar margens de segurança para eventuais variações de mercado.\n\n"
+        "🧠 **Comentário Técnico:** Para maximizar resultados, é interessante realizar ajustes finos nas variáveis do sistema e promover atualizações periódicas com novos dados de comportamento de passageiros."
+    ),
+    "proximo": (
+        "O ROI calculado ({roi:.2f}%) está **próximo ou igual** ao ROI esperado ({esperado:.2f}%).\n\n"
+        "💰 **Comentário Financeiro:** Embora o retorno seja coerente com o objetivo, ele é sensível a pequenas mudanças de mercado. Recomenda-se acompanhar de perto os custos operacionais e otimizar processos para ampliar a margem.\n\n"
+        "🧠 **Comentário Técnico:** O sistema é funcional, mas pode se beneficiar de melhorias em fontes de dados e algoritmos de previsão para aumentar a robustez frente a cenários inesperados."
+    ),
+    "abaixo": (
+        "O ROI calculado ({roi:.2f}%) está **abaixo** do ROI esperado ({esperado:.2f}%).\n\n"
+        "💰 **Comentário Financeiro:** Há risco de o investimento não alcançar o retorno planejado. Alternativas como renegociar o custo de implementação ou buscar subsídios podem ser consideradas.\n\n"
+        "🧠 **Comentário Técnico:** O sistema pode estar superestimando a demanda ou subestimando custos. Ajustar as premissas de simulação e incorporar mais variáveis exógenas pode corrigir essas distorções."
+    ),
+    "muito_abaixo": (
+        "O ROI calculado ({roi:.2f}%) está **muito abaixo** do ROI esperado ({esperado:.2f}%).\n\n"
+        "💰 **Comentário Financeiro:** Nesse cenário, o investimento não se justifica sem ajustes substanciais. É recomendado reavaliar a continuidade do projeto ou repensar a estratégia de adoção.\n\n"
+        "🧠 **Comentário Técnico:** Uma revisão completa do sistema é necessária. A integração de dados em tempo real, uso de IA preditiva e segmentação de passageiros podem ser caminhos para viabilizar resultados futuros melhores."
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Decisao:
+    """Faixa de decisão e comentário para um par (ROI obtido, ROI esperado)."""
+
+    roi_percent: float
+    roi_esperado: float
+    proporcao: float
+    faixa: str
+
+    @property
+    def comentario(self) -> str:
+        return COMENTARIOS[self.faixa].format(roi=self.roi_percent, esperado=self.roi_esperado)
+
+
+def classificar_decisao(roi_percent: float, roi_esperado: float) -> Decisao:
+    """Classifica ``roi_percent`` pela diferença relativa ao ``roi_esperado``."""
+    diferenca = roi_percent - roi_esperado
+    proporcao = diferenca / roi_esperado if roi_esperado != 0 else 0
+    faixa = next((nome for nome, limite in FAIXAS if proporcao >= limite), "muito_abaixo")
+    return Decisao(roi_percent, roi_esperado, proporcao, faixa)
+
+
+def proporcoes_roi(rois, roi_esperado):
+    """Diferença relativa ao ROI esperado (zero quando ``roi_esperado == 0``); aceita arrays."""
+    rois, roi_esperado = np.broadcast_arrays(np.asarray(rois, dtype=float), np.asarray(roi_esperado, dtype=float))
+    return np.divide(rois - roi_esperado, roi_esperado, out=np.zeros(rois.shape), where=roi_esperado != 0)
+
+
+def indices_faixas(proporcoes) -> np.ndarray:
+    """Índice em :data:`ORDEM_CRESCENTE` da faixa de cada proporção (vetorizado)."""
+    limites = [limite for _, limite in reversed(FAIXAS[:-1])]
+    return np.searchsorted(limites, proporcoes, side="right")
+
+
+@dataclass(frozen=True)
+class DecisaoDistribuicao:
+    """Decisão a partir de uma distribuição de ROIs simulados.
+
+    ``probabilidades`` traz a fração de cenários em cada faixa de
+    :data:`FAIXAS`; ``mediana`` é a decisão para o ROI mediano.
+    """
+
+    mediana: Decisao
+    probabilidades: dict
+    prob_atingir: float
+
+
+def classificar_distribuicao(rois, roi_esperado: float) -> DecisaoDistribuicao:
+    """Classifica todos os ``rois`` de uma vez nas faixas de :func:`classificar_decisao`."""
+    rois = np.asarray(rois, dtype=float)
+    rois = rois[np.isfinite(rois)]
+    if not rois.size:
+        raise ValueError("A distribuição de ROI não tem cenários válidos.")
+    contagens = np.bincount(indices_faixas(proporcoes_roi(rois, roi_esperado)), minlength=len(FAIXAS))
+    return DecisaoDistribuicao(
+        mediana=classificar_decisao(float(np.median(rois)), roi_esperado),
+        probabilidades={nome: contagem / rois.size for nome, contagem in zip(ORDEM_CRESCENTE, contagens)},
+        prob_atingir=float((rois >= roi_esperado).mean()),
+    )
@@ -0,0 +1,188 @@
+"""Simulação plurianual do investimento: VPL, TIR e payback (aba 2).
+
+Receita e custo operacional seguem trajetórias lognormais ano a ano (média
+anual ``crescimento``, volatilidade ``volatilidade``), com choques
+correlacionados entre si por ``correlacao``. Para cada bloco de cenários a
+simulação é uma matriz (cenários × anos) e todos os indicadores saem de
+operações sobre essa matriz:
+
+* VPL: ``-investimento + Σ fluxo_t / (1 + taxa)^t``;
+* TIR: Newton vetorizado sobre todos os cenários ao mesmo tempo (``nan``
+  quando não converge, p. ex. fluxos que nunca pagam o investimento);
+* payback: ano (fracionário) em que o fluxo acumulado cobre o investimento
+  (``inf`` se não cobre no horizonte);
+* ROI médio anual: ``média(fluxo) / investimento * 100``, comparável ao ROI
+  de um ano de :func:`motor.roi.calcular_roi` e usado na decisão da aba 3.
+
+Os sorteios usam os blocos e fluxos de :mod:`motor.montecarlo`, opcionalmente
+em vários processos (:mod:`motor.paralelo`). Cada bloco é resumido num sketch
+de quantis (:class:`motor.acumuladores.Quantis`) e descartado, e o resultado
+guarda só os resumos: a memória é a de um bloco mais alguns KB por bloco, e
+as entradas memoizadas ocupam poucos KB qualquer que seja ``simulacoes``.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from motor.acumuladores import Quantis
+from motor.cache import memoizar
+from motor.paralelo import executar_em_blocos
+
+# Cenários por bloco: limita as matrizes (cenários × anos) a alguns MB
+TAMANHO_BLOCO = 100_000
+ITERACOES_TIR = 50
+INDICADORES = ("vpl", "tir", "payback", "roi_anual")
+# Quantis guardados por indicador: percentis com resolução de 0,1
+PONTOS_QUANTIS = 1001
+# O sketch do VPL é mais fino porque também dá as contagens do histograma
+PONTOS_SKETCH_VPL = 10_001
+FAIXAS_HISTOGRAMA_VPL = 40
+
+
+@dataclass(frozen=True)
+class SimulacaoFluxo:
+    """Resumo da simulação plurianual (arrays somente leitura).
+
+    ``quantis[indicador]`` traz os percentis 0, 0,1, ..., 100 dos cenários
+    (sem os ``nan`` da TIR) ou ``nan`` se não houver cenário válido. Cada
+    percentil é um dos cenários (``inverted_cdf``, sem interpolar): no
+    payback, ``inf`` quando o percentil cai entre os que não recuperam. Com
+    mais de um bloco os percentis e o histograma vêm dos sketches, com erro
+    de até 0,1% na ordem (0,01% no VPL).
+    """
+
+    anos: int
+    taxa_desconto: float
+    simulacoes: int
+    quantis: dict
+    prob_vpl_positivo: float
+    prob_payback: float
+    histograma_vpl: tuple  # (contagens, bordas), como np.histogram
+
+    def percentis(self, indicador: str, qs=(10, 50, 90)) -> np.ndarray:
+        """Percentis ``qs`` (arredondados para 0,1) de ``indicador``."""
+        indices = np.rint(np.asarray(qs, dtype=float) * (PONTOS_QUANTIS - 1) / 100).astype(np.int64)
+        return self.quantis[indicador][indices]
+
+    def amostra_quantis(self, indicador: str) -> np.ndarray:
+        """Os quantis como amostra equiponderada da distribuição (erro de ~0,1% nas proporções).
+
+        Serve para :func:`motor.decisao.classificar_distribuicao` sem guardar os cenários.
+        """
+        return self.quantis[indicador]
+
+
+def _tir(fluxos, investimento, chute):
+    """TIR de cada linha por Newton em ``v = 1 / (1 + tir)``."""
+    t = np.arange(1, fluxos.shape[1] + 1)
+    v = 1 / (1 + chute)
+    for _ in range(ITERACOES_TIR):
+        potencias = v[:, None] ** t
+        valor = (fluxos * potencias).sum(axis=1) - investimento
+        derivada = (fluxos * t * potencias).sum(axis=1) / v
+        passo = np.divide(valor, derivada, out=np.zeros_like(valor), where=derivada != 0)
+        v = np.clip(v - passo, 1e-6, 1e3)
+        if np.all(np.abs(passo) < 1e-12):
+            break
+    residuo = (fluxos * v[:, None] ** t).sum(axis=1) - investimento
+    convergiu = np.abs(residuo) <= 1e-6 * max(investimento, 1)
+    return np.where(convergiu, 1 / v - 1, np.nan)
+
+
+def _payback(fluxos, investimento):
+    acumulado = np.cumsum(fluxos, axis=1)
+    cobre = acumulado >= investimento
+    recupera = cobre.any(axis=1)
+    ano = np.argmax(cobre, axis=1)
+    linhas = np.arange(fluxos.shape[0])
+    antes = np.where(ano > 0, acumulado[linhas, ano - 1], 0.0)
+    fracao = (investimento - antes) / fluxos[linhas, ano]
+    return np.where(recupera, ano + fracao, np.inf)
+
+
+class _AcumuladorFluxo:
+    def __init__(self):
+        self.quantis = {nome: Quantis(PONTOS_SKETCH_VPL if nome == "vpl" else PONTOS_QUANTIS)
+                        for nome in INDICADORES}
+        self.vpl_positivo = 0
+        self.recupera = 0
+
+    def combinar(self, outro: "_AcumuladorFluxo") -> None:
+        for nome, quantis in self.quantis.items():
+            quantis.combinar(outro.quantis[nome])
+        self.vpl_positivo += outro.vpl_positivo
+        self.recupera += outro.recupera
+
+
+class _TarefaFluxo:
+    def __init__(self, investimento, receita, custo, anos, crescimento_receita, crescimento_custo,
+                 volatilidade_receita, volatilidade_custo, correlacao, taxa_desconto):
+        self.investimento = investimento
+        self.anos = anos
+        self.taxa_desconto = taxa_desconto
+        self.base = np.array([receita, custo], dtype=float)
+        self.crescimento = np.log1p([crescimento_receita, crescimento_custo])
+        self.volatilidade = np.array([volatilidade_receita, volatilidade_custo], dtype=float)
+        self.cholesky = np.linalg.cholesky([[1, correlacao], [correlacao, 1 + 1e-12]])
+
+    def __call__(self, gerador: np.random.Generator, tamanho: int) -> _AcumuladorFluxo:
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            indicadores = self._indicadores(gerador, tamanho)
+        acumulador = _AcumuladorFluxo()
+        for nome, valores in zip(INDICADORES, indicadores):
+            acumulador.quantis[nome].adicionar(valores)
+        vpl, _, payback, _ = indicadores
+        acumulador.vpl_positivo = int(np.count_nonzero(vpl > 0))
+        acumulador.recupera = int(np.count_nonzero(np.isfinite(payback)))
+        return acumulador
+
+    def _indicadores(self, gerador, tamanho):
+        choques = gerador.standard_normal((tamanho, self.anos, 2)) @ self.cholesky.T
+        # Log-retornos anuais: ano 1 já traz incerteza; média de cada ano = base·(1+crescimento)^(t-1)
+        log_retornos = self.volatilidade * choques - self.volatilidade ** 2 / 2
+        log_retornos[:, 1:, :] += self.crescimento
+        trajetorias = self.base * np.exp(np.cumsum(log_retornos, axis=1))
+        fluxos = trajetorias[..., 0] - trajetorias[..., 1]
+
+        descontos = (1 + self.taxa_desconto) ** -np.arange(1, self.anos + 1)
+        vpl = fluxos @ descontos - self.investimento
+        roi_anual = fluxos.mean(axis=1) / self.investimento * 100
+        tir = _tir(fluxos, self.investimento, np.clip(roi_anual / 100, -0.5, 5))
+        payback = _payback(fluxos, self.investimento)
+        return vpl, tir, payback, roi_anual
+
+
+@memoizar(tamanho_maximo=16)
+def simular_fluxo_caixa(investimento: float, receita: float, custo_operacional: float, anos: int = 5,
+                        crescimento_receita: float = 0.0, crescimento_custo: float = 0.0,
+                        volatilidade_receita: float = 0.15, volatilidade_custo: float = 0.05,
+                        correlacao: float = 0.0, taxa_desconto: float = 0.10, simulacoes: int = 100_000,
+                        semente: Optional[int] = None, trabalhadores: int = 1) -> SimulacaoFluxo:
+    """Simula ``simulacoes`` trajetórias de ``anos`` anos e devolve os indicadores.
+
+    Crescimentos, volatilidades e taxa são frações anuais (0.1 = 10%).
+    Memoizada: com a mesma semente, a mesma chamada devolve o mesmo objeto.
+    Os cenários são descartados depois de resumidos (ver :class:`SimulacaoFluxo`);
+    o resultado não depende de ``trabalhadores``.
+    """
+    if investimento <= 0 or anos < 1 or simulacoes < 1 or not -1 <= correlacao <= 1:
+        raise ValueError("Requer investimento > 0, anos ≥ 1, simulacoes ≥ 1 e -1 ≤ correlacao ≤ 1.")
+    tarefa = _TarefaFluxo(investimento, receita, custo_operacional, anos, crescimento_receita,
+                          crescimento_custo, volatilidade_receita, volatilidade_custo, correlacao,
+                          taxa_desconto)
+    acumulador = executar_em_blocos(tarefa, simulacoes, semente, trabalhadores, TAMANHO_BLOCO)
+    # Percentis sem interpolar: entre um payback finito e um infinito daria inf - inf = nan
+    grade = np.linspace(0, 100, PONTOS_QUANTIS)
+    quantis = {nome: sketch.percentis(grade) for nome, sketch in acumulador.quantis.items()}
+    vpl = acumulador.quantis["vpl"]
+    minimo, maximo = quantis["vpl"][[0, -1]]
+    if minimo == maximo:  # como np.histogram com todos os valores iguais
+        minimo, maximo = minimo - 0.5, maximo + 0.5
+    bordas = np.linspace(minimo, maximo, FAIXAS_HISTOGRAMA_VPL + 1)
+    contagens = vpl.contagens(bordas)
+    for array in (*quantis.values(), contagens, bordas):
+        array.flags.writeable = False
+    return SimulacaoFluxo(anos, taxa_desconto, simulacoes, quantis, acumulador.vpl_positivo / simulacoes,
+                          acumulador.recupera / simulacoes, (contagens, bordas))
@@ -0,0 +1,158 @@
+"""Medição de tempo por etapa de uma execução (rerun) do painel.
+
+Uso típico::
+
+    medicao = iniciar_medicao(perfil=True)
+    with etapa("aba1.risco"):
+        ...
+    medicao.finalizar()
+    medicao.gravar_jsonl("tempos.jsonl")
+
+As etapas são registradas na medição ativa da thread atual (o Streamlit
+executa cada sessão em uma thread), então sessões simultâneas não se
+misturam. Etapas podem se aninhar; cada uma guarda o seu ``nivel`` e só as
+de nível 0 entram em :attr:`Medicao.tempo_etapas`, para que o tempo das
+internas não seja contado duas vezes. Sem medição ativa, :func:`etapa` e
+:func:`cronometrar` apenas executam o código.
+
+Há dois tipos de contagem de cache. ``caches`` é a diferença de
+:func:`motor.cache.estatisticas_caches` entre o início e o fim da
+execução: os caches do motor são do processo, então ela inclui chamadas de
+outras sessões simultâneas. ``caches_pagina`` conta, só nesta thread, o que
+foi registrado com :meth:`Medicao.contar_cache` (p. ex. os ``st.cache_data``
+do painel).
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from motor.cache import estatisticas_caches
+
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class TempoEtapa:
+    nome: str
+    segundos: float
+    nivel: int = 0
+
+
+class Medicao:
+    """Tempos das etapas, acertos de cache e, opcionalmente, perfil cProfile de uma execução."""
+
+    def __init__(self, perfil: bool = False):
+        self.inicio = time.time()
+        self.etapas = []
+        self.total = None
+        self.caches = {}
+        self.caches_pagina = {}
+        self._nivel = 0
+        self._relogio = time.perf_counter()
+        self._caches_inicio = {e.nome: e for e in estatisticas_caches()}
+        self._perfil = None
+        if perfil:
+            self._perfil = cProfile.Profile()
+            try:
+                self._perfil.enable()
+            except ValueError:  # outro perfilador já ativo (ex.: sessão simultânea)
+                self._perfil = None
+
+    def registrar(self, nome: str, segundos: float, nivel: int = 0, posicao: Optional[int] = None) -> None:
+        """Registra uma etapa; ``posicao`` a coloca antes das etapas aninhadas nela."""
+        self.etapas.insert(len(self.etapas) if posicao is None else posicao, TempoEtapa(nome, segundos, nivel))
+
+    @property
+    def tempo_etapas(self) -> float:
+        """Soma das etapas de nível 0 (as aninhadas já estão contidas nelas)."""
+        return sum(e.segundos for e in self.etapas if e.nivel == 0)
+
+    def contar_cache(self, nome: str, acerto: bool) -> None:
+        contagem = self.caches_pagina.setdefault(nome, {"acertos": 0, "faltas": 0})
+        contagem["acertos" if acerto else "faltas"] += 1
+
+    def faltas_cache(self, nome: str) -> int:
+        return self.caches_pagina.get(nome, {}).get("faltas", 0)
+
+    def finalizar(self) -> "Medicao":
+        """Encerra a medição (chamadas repetidas não fazem nada)."""
+        if self.total is not None:
+            return self
+        if self._perfil is not None:
+            self._perfil.disable()
+        self.total = time.perf_counter() - self._relogio
+        for atual in estatisticas_caches():
+            antes = self._caches_inicio.get(atual.nome)
+            acertos = atual.acertos - (antes.acertos if antes else 0)
+            faltas = atual.faltas - (antes.faltas if antes else 0)
+            if acertos or faltas:
+                self.caches[atual.nome] = {"acertos": acertos, "faltas": faltas}
+        if getattr(_local, "medicao", None) is self:
+            _local.medicao = None
+        return self
+
+    def relatorio_perfil(self, linhas: int = 25, ordem: str = "cumulative") -> Optional[str]:
+        """Texto do ``pstats`` com as ``linhas`` funções mais caras, se houve perfil."""
+        if self._perfil is None:
+            return None
+        saida = io.StringIO()
+        pstats.Stats(self._perfil, stream=saida).sort_stats(ordem).print_stats(linhas)
+        return saida.getvalue()
+
+    def como_dict(self) -> dict:
+        return {"inicio": self.inicio, "total": self.total,
+                "etapas": [asdict(e) for e in self.etapas], "caches": self.caches,
+                "caches_pagina": self.caches_pagina}
+
+    def gravar_jsonl(self, caminho: str) -> None:
+        """Acrescenta a medição como uma linha JSON em ``caminho``."""
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(self.como_dict(), ensure_ascii=False) + "\n")
+
+
+def iniciar_medicao(perfil: bool = False) -> Medicao:
+    """Cria uma medição e a torna ativa na thread atual."""
+    _local.medicao = Medicao(perfil)
+    return _local.medicao
+
+
+def medicao_atual() -> Optional[Medicao]:
+    return getattr(_local, "medicao", None)
+
+
+@contextmanager
+def etapa(nome: str):
+    """Cronometra o bloco e o registra na medição ativa (se houver)."""
+    medicao = medicao_atual()
+    if medicao is None:
+        yield
+        return
+    nivel, posicao = medicao._nivel, len(medicao.etapas)
+    medicao._nivel += 1
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao._nivel = nivel
+        medicao.registrar(nome, time.perf_counter() - inicio, nivel, posicao)
+
+
+def cronometrar(nome: Optional[str] = None):
+    """Decorador equivalente a envolver a função em :func:`etapa`."""
+    def decorador(funcao):
+        rotulo = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with etapa(rotulo):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
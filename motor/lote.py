@@ -0,0 +1,249 @@
+"""Otimização de overbooking em lote para uma frota inteira.
+
+Recebe uma tabela de voos (CSV ou Parquet) com as colunas ``capacidade``,
+``p``, ``receita_passagem`` e ``custo_indenizacao`` (opcionalmente
+``risco_maximo`` em % e ``vendidas``) e calcula, para todos os voos de uma
+vez, o limite de vendas, o risco e o resultado financeiro esperado. Arquivos
+grandes são processados em blocos e gravados incrementalmente.
+
+Uso::
+
+    python -m motor.lote voos.csv resultado.csv --risco-maximo 7
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy.stats import binom
+
+from motor.overbooking import EXCESSO_MAXIMO, preteridos_esperados
+
+COLUNAS_OBRIGATORIAS = ("capacidade", "p", "receita_passagem", "custo_indenizacao")
+TAMANHO_BLOCO = 100_000
+SEM_LIMITE = f"sem limite de vendas (o risco não chega ao máximo com até {EXCESSO_MAXIMO} extras)"
+# Motivos da coluna ``erro``; o código de cada voo é a posição + 1 (0 = válido)
+MOTIVOS = (
+    "capacidade ausente ou não finita",
+    "p ausente ou não finito",
+    "risco_maximo ausente ou não finito",
+    "capacidade precisa ser inteira ≥ 1",
+    "p precisa estar em (0, 1]",
+    "risco_maximo precisa ser < 100%",
+    "vendidas ausente ou não finita",
+    SEM_LIMITE,
+)
+
+
+def _numeros(voos, coluna):
+    """Coluna como ``float``; células vazias ou com texto viram ``NaN`` (e erro no voo)."""
+    return pd.to_numeric(voos[coluna], errors="coerce").to_numpy(dtype=float)
+
+
+def _converter(capacidade, p, risco_maximo):
+    capacidade = np.asarray(capacidade, dtype=float)
+    p = np.broadcast_to(np.asarray(p, dtype=float), capacidade.shape)
+    limite = np.broadcast_to(np.asarray(risco_maximo, dtype=float) / 100, capacidade.shape)
+    return capacidade, p, limite
+
+
+def _problemas(capacidade, p, limite):
+    """Código do motivo pelo qual cada voo não pode ser otimizado (0 nos válidos; ver ``MOTIVOS``).
+
+    Valores ausentes (NaN) precisam ser recusados: um NaN em ``p`` ou
+    ``risco_maximo`` faz ``binom.sf(...) > nan`` ser sempre falso e a busca
+    exponencial nunca termina.
+    """
+    regras = (
+        ~np.isfinite(capacidade),
+        ~np.isfinite(p),
+        ~np.isfinite(limite),
+        (capacidade < 1) | (capacidade != np.round(capacidade)),
+        (p <= 0) | (p > 1),
+        limite >= 1,
+    )
+    codigos = np.zeros(capacidade.shape, dtype=np.int8)
+    for codigo, invalido in enumerate(regras, start=1):
+        codigos[invalido & (codigos == 0)] = codigo
+    return codigos
+
+
+def _buscar_limites(capacidade, p, limite):
+    """Busca exponencial + bisseção para voos já validados.
+
+    Devolve os limites e a máscara dos voos cujo risco não chega ao máximo
+    nem com ``EXCESSO_MAXIMO`` passagens extras (limite indefinido).
+    """
+    def excede(excesso, idx):
+        return binom.sf(capacidade[idx], capacidade[idx] + excesso[idx], p[idx]) > limite[idx]
+
+    dentro = np.zeros(capacidade.shape, dtype=np.int64)
+    fora = np.ones(capacidade.shape, dtype=np.int64)
+    sem_limite = np.zeros(capacidade.shape, dtype=bool)
+    abertos = np.flatnonzero(~excede(fora, slice(None)))
+    while abertos.size:
+        estourou = fora[abertos] >= EXCESSO_MAXIMO
+        sem_limite[abertos[estourou]] = True
+        abertos = abertos[~estourou]
+        dentro[abertos] = fora[abertos]
+        fora[abertos] *= 2
+        abertos = abertos[~excede(fora, abertos)]
+
+    abertos = np.flatnonzero((fora - dentro > 1) & ~sem_limite)
+    while abertos.size:
+        meio = (dentro + fora) // 2
+        recusado = excede(meio, abertos)
+        fora[abertos[recusado]] = meio[abertos[recusado]]
+        dentro[abertos[~recusado]] = meio[abertos[~recusado]]
+        abertos = abertos[fora[abertos] - dentro[abertos] > 1]
+    return capacidade + dentro, sem_limite
+
+
+def limite_vendas_lote(capacidade, p, risco_maximo):
+    """Versão vetorizada de :func:`motor.overbooking.limite_vendas`.
+
+    Faz a mesma busca exponencial + bisseção, mas cada passo avalia
+    ``binom.sf`` para todos os voos ainda em aberto numa única chamada.
+    Levanta ``ValueError`` se algum voo for inválido ou não tiver limite.
+    """
+    capacidade, p, limite = _converter(capacidade, p, risco_maximo)
+    codigos = _problemas(capacidade, p, limite)
+    if codigos.any():
+        voo = int(np.argmax(codigos != 0))
+        raise ValueError(f"Voo {voo}: {MOTIVOS[codigos[voo] - 1]}.")
+    limites, sem_limite = _buscar_limites(capacidade.astype(np.int64), p, limite)
+    if sem_limite.any():
+        raise ValueError(f"Voo {int(np.argmax(sem_limite))}: {SEM_LIMITE}.")
+    return limites
+
+
+def otimizar_tabela(voos: pd.DataFrame, risco_maximo: float = 7) -> pd.DataFrame:
+    """Acrescenta à tabela de voos as colunas calculadas.
+
+    ``risco_maximo`` (em %) é usado quando a tabela não tem essa coluna. As
+    colunas acrescentadas são ``limite_vendas``, ``risco_limite`` (risco no
+    limite), ``risco_vendidas`` (se houver ``vendidas``), ``receita_extra``,
+    ``preteridos_esperados``, ``custo_esperado`` (preteridos esperados ×
+    indenização, como na aba 1), ``lucro_extra_esperado`` e ``erro``. Voos
+    inválidos (célula vazia, ``p`` fora de (0, 1]...) não interrompem a
+    tabela: ficam com as colunas calculadas vazias e o motivo em ``erro``.
+    """
+    faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in voos.columns]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+
+    receita = _numeros(voos, "receita_passagem")
+    custo = _numeros(voos, "custo_indenizacao")
+    if "risco_maximo" in voos.columns:
+        risco_maximo = _numeros(voos, "risco_maximo")
+    capacidade, p, limite_risco = _converter(_numeros(voos, "capacidade"), _numeros(voos, "p"), risco_maximo)
+    codigos = _problemas(capacidade, p, limite_risco)
+    tem_vendidas = "vendidas" in voos.columns
+    if tem_vendidas:
+        vendidas = _numeros(voos, "vendidas")
+        codigos[~np.isfinite(vendidas) & (codigos == 0)] = MOTIVOS.index("vendidas ausente ou não finita") + 1
+
+    validos = np.flatnonzero(codigos == 0)
+    limites, sem_limite = _buscar_limites(capacidade[validos].astype(np.int64), p[validos],
+                                          limite_risco[validos])
+    codigos[validos[sem_limite]] = MOTIVOS.index(SEM_LIMITE) + 1
+    validos, limites = validos[~sem_limite], limites[~sem_limite]
+    cap, prob = capacidade[validos].astype(np.int64), p[validos]
+
+    def coluna(valores):
+        if validos.size == len(voos):
+            return valores
+        completa = np.full(len(voos), np.nan)
+        completa[validos] = valores
+        return completa
+
+    resultado = voos.copy()
+    resultado["limite_vendas"] = pd.array(coluna(limites), dtype="Int64")
+    resultado["risco_limite"] = coluna(binom.sf(cap, limites, prob))
+    if tem_vendidas:
+        resultado["risco_vendidas"] = coluna(binom.sf(cap, vendidas[validos].astype(np.int64), prob))
+    resultado["receita_extra"] = coluna(receita[validos] * (limites - cap))
+    resultado["preteridos_esperados"] = coluna(preteridos_esperados(cap, limites, prob))
+    resultado["custo_esperado"] = resultado["preteridos_esperados"] * custo
+    resultado["lucro_extra_esperado"] = resultado["receita_extra"] - resultado["custo_esperado"]
+    # Categórica com as mesmas categorias em todo bloco (esquema estável no Parquet)
+    resultado["erro"] = pd.Categorical.from_codes(codigos.astype(np.int64) - 1, categories=MOTIVOS)
+    return resultado
+
+
+def _ler_blocos(caminho, tamanho_bloco):
+    if caminho.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as erro:
+            raise ImportError("Leitura de Parquet requer o pacote 'pyarrow'.") from erro
+        for lote in pq.ParquetFile(caminho).iter_batches(batch_size=tamanho_bloco):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(caminho, chunksize=tamanho_bloco)
+
+
+def otimizar_arquivo(entrada: str, saida: str, risco_maximo: float = 7,
+                     tamanho_bloco: int = TAMANHO_BLOCO) -> int:
+    """Processa ``entrada`` em blocos e grava o resultado em ``saida``.
+
+    O formato de cada arquivo é definido pela extensão (``.parquet`` ou CSV).
+    Voos inválidos vão para a saída com a coluna ``erro`` preenchida. Os
+    blocos são gravados num arquivo temporário, renomeado para ``saida`` só
+    no fim: se algo falhar no meio, nenhuma saída parcial fica para trás.
+    Retorna o número de voos processados.
+    """
+    temporario = f"{saida}.parcial"
+    escritor = None
+    total = 0
+    try:
+        for bloco in _ler_blocos(entrada, tamanho_bloco):
+            resultado = otimizar_tabela(bloco, risco_maximo)
+            if saida.endswith(".parquet"):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                tabela = pa.Table.from_pandas(resultado, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(temporario, tabela.schema)
+                else:  # ex.: coluna inteira num bloco e com células vazias (float) em outro
+                    tabela = tabela.cast(escritor.schema)
+                escritor.write_table(tabela)
+            else:
+                resultado.to_csv(temporario, mode="w" if total == 0 else "a", header=total == 0, index=False)
+            total += len(resultado)
+        if escritor is not None:
+            escritor.close()
+            escritor = None
+        if os.path.exists(temporario):  # entrada sem nenhum bloco não gera saída
+            os.replace(temporario, saida)
+    finally:
+        if escritor is not None:
+            escritor.close()
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Otimização de overbooking para uma tabela de voos.")
+    parser.add_argument("entrada", help="CSV ou Parquet com os voos")
+    parser.add_argument("saida", help="arquivo de saída (CSV ou .parquet)")
+    parser.add_argument("--risco-maximo", type=float, default=7,
+                        help="risco máximo aceitável em %% (se a tabela não tiver a coluna)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.entrada):
+        parser.error(f"arquivo não encontrado: {args.entrada}")
+    try:
+        total = otimizar_arquivo(args.entrada, args.saida, args.risco_maximo, args.tamanho_bloco)
+    except (ValueError, ImportError) as erro:
+        parser.exit(1, f"erro: {erro}\n")
+    print(f"{total} voos processados -> {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Monte Carlo reprodutível com ``numpy.random.Generator``.
+
+Cada simulação é dividida em blocos de tamanho fixo e cada bloco ``i`` usa
+seu próprio fluxo, o filho ``i`` de ``SeedSequence(semente)``. Assim o
+resultado depende apenas de ``(semente, tamanho_bloco)``: pode ser
+reproduzido, cacheado e comparado entre execuções, e os blocos podem ser
+gerados em qualquer ordem (ou em paralelo) sem alterar os números sorteados.
+Sem semente, a entropia vem do sistema operacional.
+"""
+
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+TAMANHO_BLOCO = 1_000_000
+
+
+def sequencia_sementes(semente: Optional[int] = None) -> np.random.SeedSequence:
+    """``SeedSequence`` raiz; com ``semente=None`` sorteia uma nova entropia."""
+    return np.random.SeedSequence(semente)
+
+
+def fluxo(semente: Optional[int] = None) -> np.random.Generator:
+    """Gerador único para sorteios pequenos (não divididos em blocos)."""
+    return np.random.Generator(np.random.PCG64(sequencia_sementes(semente)))
+
+
+def fluxos(semente: Optional[int], quantidade: int) -> list:
+    """``quantidade`` geradores estatisticamente independentes (``SeedSequence.spawn``)."""
+    return [np.random.Generator(np.random.PCG64(filha))
+            for filha in sequencia_sementes(semente).spawn(quantidade)]
+
+
+def fluxo_bloco(raiz: np.random.SeedSequence, indice: int) -> np.random.Generator:
+    """Gerador do bloco ``indice``: o mesmo que ``raiz.spawn(...)[indice]``.
+
+    Calculado diretamente pela ``spawn_key``, sem precisar criar os filhos
+    anteriores, o que permite gerar um bloco isolado em outro processo.
+    """
+    filha = np.random.SeedSequence(raiz.entropy, spawn_key=raiz.spawn_key + (indice,),
+                                   pool_size=raiz.pool_size)
+    return np.random.Generator(np.random.PCG64(filha))
+
+
+def tamanhos_blocos(total: int, tamanho_bloco: int = TAMANHO_BLOCO) -> list:
+    """Divide ``total`` sorteios em blocos de no máximo ``tamanho_bloco``."""
+    if total < 0 or tamanho_bloco <= 0:
+        raise ValueError("total deve ser ≥ 0 e tamanho_bloco > 0.")
+    cheios, resto = divmod(total, tamanho_bloco)
+    return [tamanho_bloco] * cheios + ([resto] if resto else [])
+
+
+def amostras_em_blocos(amostrar: Callable[[np.random.Generator, int], np.ndarray], total: int,
+                       semente: Optional[int] = None,
+                       tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[np.ndarray]:
+    """Gera ``total`` amostras bloco a bloco com ``amostrar(gerador, tamanho)``.
+
+    A memória usada é a de um bloco, qualquer que seja ``total``.
+    """
+    raiz = sequencia_sementes(semente)
+    for indice, tamanho in enumerate(tamanhos_blocos(total, tamanho_bloco)):
+        yield amostrar(fluxo_bloco(raiz, indice), tamanho)
+
+
+def simular_conversoes(chamadas: int, p: float, empregados: int, simulacoes: int,
+                       semente: Optional[int] = None) -> np.ndarray:
+    """Total de conversões diárias do call center em cada simulação.
+
+    A soma de ``empregados`` binomiais independentes ``B(chamadas, p)`` é
+    ``B(chamadas * empregados, p)``: um único sorteio por simulação.
+    """
+    return fluxo(semente).binomial(chamadas * empregados, p, size=simulacoes)
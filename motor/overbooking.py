@@ -0,0 +1,160 @@
+"""Risco de overbooking com modelo binomial (aba 1)."""
+
+from dataclasses import dataclass
+import numpy as np
+from scipy.stats import binom
+
+from motor.cache import memoizar
+from motor.tabela_risco import linha_risco
+
+# Maior excesso de vendas considerado na busca do limite: com ``p`` quase
+# zero o risco nunca chega ao máximo e a busca exponencial não pararia
+EXCESSO_MAXIMO = 2 ** 30
+
+
+@dataclass(frozen=True)
+class CurvaRisco:
+    """Risco de overbooking para cada quantidade de passagens vendidas."""
+
+    capacidade: int
+    p: float
+    vendas: np.ndarray
+    riscos: np.ndarray
+
+
+def risco_overbooking(capacidade, vendidas, p):
+    """Probabilidade de mais de ``capacidade`` passageiros comparecerem.
+
+    ``vendidas`` pode ser um inteiro ou um array; usa ``binom.sf``, que é
+    equivalente a ``1 - binom.cdf`` sem perda de precisão na cauda. Chamadas
+    escalares são memoizadas e, dentro do domínio da tabela pré-calculada
+    (:mod:`motor.tabela_risco`), lidas dela.
+    """
+    if np.ndim(vendidas) == 0 and np.ndim(capacidade) == 0 and np.ndim(p) == 0:
+        return _risco_pontual(int(capacidade), int(vendidas), float(p))
+    return binom.sf(capacidade, vendidas, p)
+
+
+@memoizar()
+def _risco_pontual(capacidade: int, vendidas: int, p: float) -> float:
+    linha = linha_risco(capacidade, p)
+    if linha is not None and 0 <= vendidas - capacidade < len(linha):
+        return float(linha[vendidas - capacidade])
+    return float(binom.sf(capacidade, vendidas, p))
+
+
+@memoizar()
+def curva_risco(capacidade: int, p: float, faixa: int = 20) -> CurvaRisco:
+    """Curva de risco de ``capacidade`` até ``capacidade + faixa`` vendas.
+
+    Memoizada por ``(capacidade, p, faixa)``; os arrays são somente leitura.
+    Usa a tabela pré-calculada quando ela cobre a curva inteira.
+    """
+    vendas = np.arange(capacidade, capacidade + faixa + 1)
+    linha = linha_risco(capacidade, p)
+    if linha is not None and faixa < len(linha):
+        riscos = np.array(linha[:faixa + 1])
+    else:
+        riscos = binom.sf(capacidade, vendas, p)
+    vendas.flags.writeable = False
+    riscos.flags.writeable = False
+    return CurvaRisco(capacidade, p, vendas, riscos)
+
+
+@memoizar()
+def limite_vendas(capacidade: int, p: float, risco_maximo: float) -> int:
+    """Maior número de passagens com risco de overbooking ≤ ``risco_maximo`` (%).
+
+    O risco é crescente em ``n``, então basta uma busca exponencial pelo
+    primeiro ``n`` que ultrapassa o limite seguida de bisseção: O(log n)
+    avaliações de ``binom.sf``, sem teto artificial de vendas e sem o
+    arredondamento da tabela exibida. Com ``n = capacidade`` o risco é zero,
+    logo o resultado nunca é menor que a capacidade. Se a tabela
+    pré-calculada cobre o limite, basta um ``searchsorted`` na linha dela.
+    """
+    if not 0 <= p <= 1 or np.isnan(risco_maximo):
+        raise ValueError("Requer 0 ≤ p ≤ 1 e risco_maximo definido.")
+    limite = risco_maximo / 100
+    if limite >= 1 or p == 0:
+        raise ValueError("Sem limite de vendas: o risco nunca ultrapassa o máximo definido.")
+    if p == 1 or limite < 0:
+        return capacidade
+
+    linha = linha_risco(capacidade, p)
+    if linha is not None and linha[-1] > limite:
+        return capacidade + int(np.searchsorted(linha, limite, side="right")) - 1
+
+    def excede(excesso):
+        return binom.sf(capacidade, capacidade + excesso, p) > limite
+
+    # Busca exponencial: dentro = último excesso aceito, fora = primeiro recusado
+    dentro, fora = 0, 1
+    while not excede(fora):
+        if fora >= EXCESSO_MAXIMO:
+            raise ValueError(f"Sem limite de vendas: o risco não ultrapassa o máximo com até "
+                             f"{EXCESSO_MAXIMO} passagens extras.")
+        dentro, fora = fora, fora * 2
+    while fora - dentro > 1:
+        meio = (dentro + fora) // 2
+        if excede(meio):
+            fora = meio
+        else:
+            dentro = meio
+    return capacidade + dentro
+
+
+def preteridos_esperados(capacidade, vendidas, p):
+    """``E[max(X - capacidade, 0)]`` com ``X ~ Binomial(vendidas, p)``.
+
+    Usa ``E[X·1{X > c}] = n·p·P(Y ≥ c)`` com ``Y ~ Binomial(n - 1, p)``: duas
+    chamadas de ``binom.sf``, O(1) por par ``(capacidade, vendidas)`` e sem
+    matriz de PMF. Aceita arrays (voo a voo em :mod:`motor.lote`, nível a
+    nível em :func:`curva_lucro`).
+    """
+    capacidade = np.asarray(capacidade)
+    vendidas = np.asarray(vendidas)
+    acima = vendidas * p * binom.sf(capacidade - 1, vendidas - 1, p)
+    return np.clip(acima - capacidade * binom.sf(capacidade, vendidas, p), 0, None)
+
+
+@dataclass(frozen=True)
+class CurvaLucro:
+    """Resultado financeiro esperado para cada excesso de vendas ``0..K``."""
+
+    capacidade: int
+    p: float
+    excessos: np.ndarray
+    riscos: np.ndarray
+    preteridos: np.ndarray
+    receitas: np.ndarray
+    custos: np.ndarray
+    lucros: np.ndarray
+
+    @property
+    def excesso_otimo(self) -> int:
+        return int(self.excessos[np.argmax(self.lucros)])
+
+    @property
+    def lucro_otimo(self) -> float:
+        return float(self.lucros.max())
+
+
+@memoizar()
+def curva_lucro(capacidade: int, p: float, receita_passagem: float,
+                custo_indenizacao: float, excesso_maximo: int = 30) -> CurvaLucro:
+    """Lucro esperado de vender ``capacidade + k`` passagens, ``k = 0..excesso_maximo``.
+
+    O custo usa o número esperado de passageiros preteridos,
+    ``E[max(X - capacidade, 0)]`` com ``X ~ Binomial(capacidade + k, p)``, e
+    não só a probabilidade de haver overbooking (ver
+    :func:`preteridos_esperados`; O(K) em tempo e memória).
+    """
+    excessos = np.arange(excesso_maximo + 1)
+    preteridos = preteridos_esperados(capacidade, capacidade + excessos, p)
+    riscos = binom.sf(capacidade, capacidade + excessos, p)
+    receitas = receita_passagem * excessos
+    custos = custo_indenizacao * preteridos
+    lucros = receitas - custos
+    for array in (excessos, riscos, preteridos, receitas, custos, lucros):
+        array.flags.writeable = False
+    return CurvaLucro(capacidade, p, excessos, riscos, preteridos, receitas, custos, lucros)
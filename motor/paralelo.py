@@ -0,0 +1,91 @@
+"""Execução de simulações Monte Carlo em um pool de processos.
+
+O total de sorteios é dividido nos blocos de :mod:`motor.montecarlo`; cada
+bloco usa o seu fluxo derivado da semente e devolve um acumulador (ver
+:mod:`motor.acumuladores`). Os acumuladores são combinados no processo
+principal sempre na ordem dos blocos, então, para a mesma semente e o mesmo
+tamanho de bloco, o resultado é idêntico bit a bit com 1 ou N processos.
+
+A tarefa precisa ser serializável (função de módulo, ``functools.partial``
+ou instância de classe de módulo) e devolver um objeto com ``combinar``.
+Os processos são iniciados por ``forkserver`` (``spawn`` onde ele não
+existe), nunca por ``fork``: o pool é criado de dentro de processos com
+várias threads (servidor do Streamlit, threads de :mod:`motor.tarefas`), e
+um ``fork`` nesse estado pode herdar travas presas e travar o filho.
+"""
+
+import functools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional
+
+from motor.montecarlo import TAMANHO_BLOCO, fluxo_bloco, sequencia_sementes, tamanhos_blocos
+
+
+def _contexto():
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(metodo)
+
+
+def trabalhadores_padrao() -> int:
+    return os.cpu_count() or 1
+
+
+def _executar_bloco(tarefa, raiz, indice, tamanho):
+    return tarefa(fluxo_bloco(raiz, indice), tamanho)
+
+
+def iterar_blocos(tarefa: Callable, total: int, semente: Optional[int] = None, trabalhadores: int = 1,
+                  tamanho_bloco: int = TAMANHO_BLOCO,
+                  cancelado: Optional[threading.Event] = None) -> Iterator[tuple]:
+    """Gera ``(tamanho, resultado)`` de cada bloco, na ordem dos blocos.
+
+    Com vários processos, mantém no máximo ``2 * trabalhadores`` blocos em
+    andamento, para que ``cancelado`` (verificado entre blocos) interrompa
+    a simulação sem esperar pelo restante dela.
+    """
+    raiz = sequencia_sementes(semente)
+    tamanhos = tamanhos_blocos(total, tamanho_bloco)
+    executar = functools.partial(_executar_bloco, tarefa, raiz)
+
+    if trabalhadores <= 1 or len(tamanhos) <= 1:
+        for indice, tamanho in enumerate(tamanhos):
+            if cancelado is not None and cancelado.is_set():
+                return
+            yield tamanho, executar(indice, tamanho)
+        return
+
+    trabalhadores = min(trabalhadores, len(tamanhos))
+    executor = ProcessPoolExecutor(max_workers=trabalhadores, mp_context=_contexto())
+    pendentes = deque()
+    proximo = 0
+    try:
+        while proximo < len(tamanhos) or pendentes:
+            while proximo < len(tamanhos) and len(pendentes) < 2 * trabalhadores:
+                pendentes.append((tamanhos[proximo], executor.submit(executar, proximo, tamanhos[proximo])))
+                proximo += 1
+            if cancelado is not None and cancelado.is_set():
+                return
+            tamanho, futuro = pendentes.popleft()
+            yield tamanho, futuro.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def executar_em_blocos(tarefa: Callable, total: int, semente: Optional[int] = None,
+                       trabalhadores: int = 1, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Executa ``tarefa(gerador, tamanho)`` em cada bloco e combina os resultados.
+
+    Com ``trabalhadores == 1`` (ou um único bloco) roda no próprio processo.
+    Retorna ``None`` se ``total`` for zero.
+    """
+    combinado = None
+    for _, resultado in iterar_blocos(tarefa, total, semente, trabalhadores, tamanho_bloco):
+        if combinado is None:
+            combinado = resultado
+        else:
+            combinado.combinar(resultado)
+    return combinado
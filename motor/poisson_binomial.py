@@ -0,0 +1,179 @@
+"""Overbooking com probabilidades de comparecimento diferentes por passageiro.
+
+As reservas são descritas por segmentos ``((quantidade, p), ...)`` (classe
+tarifária, conexão, grupo...); uma lista de probabilidades individuais vira
+segmentos com :func:`segmentos_de`. O número de passageiros que comparecem
+segue uma Poisson-binomial, cuja PMF exata sai da função característica
+``Π (1 - p + p·z)^quantidade`` avaliada nas raízes da unidade e invertida por
+FFT: uma matriz (passageiros × segmentos), montada em blocos de segmentos
+para limitar a memória. Quando essa matriz é grande demais (muitos
+passageiros com probabilidades distintas) há a aproximação normal refinada
+(com correção de assimetria).
+
+As passagens extras são vendidas com probabilidade ``p_extra`` e somadas às
+reservas; risco, limite de vendas e custo esperado têm os mesmos formatos de
+:mod:`motor.overbooking`.
+"""
+
+import numpy as np
+from scipy.stats import binom, norm
+
+from motor.cache import memoizar
+from motor.overbooking import CurvaLucro, CurvaRisco
+
+# O método "auto" usa o exato até este número de elementos (pontos × segmentos)
+# da função característica; acima dele (~0,3 s), a aproximação normal
+LIMITE_EXATO = 10_000_000
+# Elementos complexos por bloco da matriz (pontos × segmentos): ~16 MB
+ELEMENTOS_BLOCO = 1 << 20
+
+
+def segmentos_de(probabilidades) -> tuple:
+    """Agrupa probabilidades individuais iguais em segmentos ``(quantidade, p)``."""
+    valores, quantidades = np.unique(np.asarray(probabilidades, dtype=float), return_counts=True)
+    return tuple((int(q), float(v)) for q, v in zip(quantidades, valores))
+
+
+def _validar(segmentos):
+    quantidades = np.array([q for q, _ in segmentos], dtype=np.int64)
+    probabilidades = np.array([p for _, p in segmentos], dtype=float)
+    if np.any(quantidades < 0) or np.any((probabilidades < 0) | (probabilidades > 1)):
+        raise ValueError("Segmentos precisam de quantidade ≥ 0 e 0 ≤ p ≤ 1.")
+    return quantidades, probabilidades
+
+
+def _pmf_exata(quantidades, probabilidades, n):
+    # Segmentos com p = 1 só deslocam a distribuição; p = 0 não contribui.
+    certos = int(quantidades[probabilidades == 1].sum())
+    incertos = (probabilidades > 0) & (probabilidades < 1)
+    quantidades, probabilidades = quantidades[incertos], probabilidades[incertos]
+    m = int(quantidades.sum())
+    z = np.exp(2j * np.pi * np.arange(m + 1) / (m + 1))[:, None]
+    caracteristica = np.ones(m + 1, dtype=complex)
+    colunas = max(ELEMENTOS_BLOCO // (m + 1), 1)
+    for inicio in range(0, quantidades.size, colunas):
+        q = quantidades[inicio:inicio + colunas]
+        p = probabilidades[inicio:inicio + colunas]
+        caracteristica *= np.prod((1 - p + p * z) ** q, axis=1)
+    pmf = np.clip(np.fft.fft(caracteristica).real / (m + 1), 0, None)
+    completa = np.zeros(n + 1)
+    completa[certos:certos + m + 1] = pmf / pmf.sum()
+    return completa
+
+
+def _pmf_normal(quantidades, probabilidades, n):
+    media = float(quantidades @ probabilidades)
+    variancia = float(quantidades @ (probabilidades * (1 - probabilidades)))
+    if variancia == 0:
+        pmf = np.zeros(n + 1)
+        pmf[int(round(media))] = 1
+        return pmf
+    desvio = np.sqrt(variancia)
+    assimetria = float(quantidades @ (probabilidades * (1 - probabilidades) * (1 - 2 * probabilidades))) / desvio ** 3
+    x = (np.arange(-1, n + 1) + 0.5 - media) / desvio
+    acumulada = np.clip(norm.cdf(x) + assimetria * (1 - x ** 2) * norm.pdf(x) / 6, 0, 1)
+    acumulada[0], acumulada[-1] = 0.0, 1.0
+    pmf = np.clip(np.diff(acumulada), 0, None)
+    return pmf / pmf.sum()
+
+
+@memoizar()
+def distribuicao_comparecimento(segmentos: tuple, metodo: str = "auto") -> np.ndarray:
+    """PMF de ``X`` = passageiros que comparecem, para ``X = 0..n`` (somente leitura).
+
+    ``metodo`` é ``"exato"`` (função característica + FFT), ``"normal"``
+    (aproximação normal refinada) ou ``"auto"`` (exato enquanto
+    ``(n + 1) × segmentos ≤ LIMITE_EXATO``).
+    """
+    quantidades, probabilidades = _validar(segmentos)
+    n = int(quantidades.sum())
+    if metodo == "auto":
+        metodo = "exato" if (n + 1) * len(segmentos) <= LIMITE_EXATO else "normal"
+    if metodo == "exato":
+        pmf = _pmf_exata(quantidades, probabilidades, n)
+    elif metodo == "normal":
+        pmf = _pmf_normal(quantidades, probabilidades, n)
+    else:
+        raise ValueError(f"Método desconhecido: {metodo!r}")
+    pmf.flags.writeable = False
+    return pmf
+
+
+def _sobrevivencia_e_excesso(pmf, limites):
+    """``P(X > c)`` e ``E[max(X - c, 0)]`` para cada ``c`` em ``limites``.
+
+    Usa somas acumuladas da cauda (sem ``1 - cdf``, que perde precisão):
+    ``E[max(X - c, 0)] = Σ_{x>c} x·pmf - c·P(X > c)``.
+    """
+    cauda = np.append(np.cumsum(pmf[::-1])[::-1], 0.0)
+    momento = np.append(np.cumsum((np.arange(pmf.size) * pmf)[::-1])[::-1], 0.0)
+    c = np.asarray(limites)
+    indice = np.clip(c + 1, 0, pmf.size)
+    sobrevivencia = cauda[indice]
+    return sobrevivencia, momento[indice] - c * sobrevivencia
+
+
+def _com_extras(capacidade, segmentos, p_extra, faixa, metodo):
+    """Risco e preteridos esperados vendendo ``0..faixa`` passagens extras.
+
+    Com ``j`` extras comparecendo, a base precisa de ``capacidade - j``
+    assentos; combina ``binom.pmf(j, k, p_extra)`` com a base numa única
+    multiplicação de matrizes.
+    """
+    pmf = distribuicao_comparecimento(segmentos, metodo)
+    j = np.arange(faixa + 1)
+    sobrevivencia, excesso = _sobrevivencia_e_excesso(pmf, capacidade - j)
+    pesos = binom.pmf(j[None, :], j[:, None], p_extra)
+    return pesos @ sobrevivencia, pesos @ excesso
+
+
+@memoizar()
+def curva_risco_segmentos(capacidade: int, segmentos: tuple, p_extra: float,
+                          faixa: int = 20, metodo: str = "auto") -> CurvaRisco:
+    """Risco de overbooking para as reservas de ``segmentos`` mais ``0..faixa`` extras."""
+    base = sum(q for q, _ in segmentos)
+    riscos, _ = _com_extras(capacidade, segmentos, p_extra, faixa, metodo)
+    vendas = base + np.arange(faixa + 1)
+    vendas.flags.writeable = False
+    riscos.flags.writeable = False
+    return CurvaRisco(capacidade, p_extra, vendas, riscos)
+
+
+@memoizar()
+def limite_vendas_segmentos(capacidade: int, segmentos: tuple, p_extra: float,
+                            risco_maximo: float, metodo: str = "auto") -> int:
+    """Total de passagens (reservas + extras) com risco ≤ ``risco_maximo`` (%).
+
+    Se as reservas atuais já ultrapassam o limite, devolve o número de
+    reservas (não há extras a vender).
+    """
+    limite = risco_maximo / 100
+    if limite >= 1 or p_extra <= 0:
+        raise ValueError("Sem limite de vendas: o risco nunca ultrapassa o máximo definido.")
+    faixa = max(capacidade // 4, 8)
+    while True:
+        curva = curva_risco_segmentos(capacidade, segmentos, p_extra, faixa, metodo)
+        aceitos = np.flatnonzero(curva.riscos <= limite)
+        if aceitos.size == 0:
+            return int(curva.vendas[0])
+        if aceitos[-1] < faixa:
+            return int(curva.vendas[aceitos[-1]])
+        faixa *= 2
+
+
+@memoizar()
+def curva_lucro_segmentos(capacidade: int, segmentos: tuple, p_extra: float, receita_passagem: float,
+                          custo_indenizacao: float, excesso_maximo: int = 30,
+                          metodo: str = "auto") -> CurvaLucro:
+    """Como :func:`motor.overbooking.curva_lucro`, com reservas heterogêneas.
+
+    O custo de cada nível inclui os preteridos já esperados só com as reservas.
+    """
+    riscos, preteridos = _com_extras(capacidade, segmentos, p_extra, excesso_maximo, metodo)
+    excessos = np.arange(excesso_maximo + 1)
+    receitas = receita_passagem * excessos
+    custos = custo_indenizacao * preteridos
+    lucros = receitas - custos
+    for array in (excessos, riscos, preteridos, receitas, custos, lucros):
+        array.flags.writeable = False
+    return CurvaLucro(capacidade, p_extra, excessos, riscos, preteridos, receitas, custos, lucros)
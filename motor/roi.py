@@ -0,0 +1,129 @@
+"""ROI do novo sistema de previsão de demanda (aba 2)."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from motor.acumuladores import ContadorLimite, Histograma, MediaVariancia
+from motor.montecarlo import TAMANHO_BLOCO
+from motor.paralelo import executar_em_blocos
+from motor.tarefas import Trabalho, submeter
+
+# Amplitude do histograma de ROI, em desvios-padrão ao redor da média
+DESVIOS_HISTOGRAMA = 8
+
+
+@dataclass(frozen=True)
+class SimulacaoROI:
+    """Estatísticas do ROI simulado com receita normal, sem guardar as amostras."""
+
+    simulacoes: int
+    realista: float
+    desvio: float
+    minimo: float
+    maximo: float
+    otimista: float
+    pessimista: float
+    prob_receita_baixa: float
+    histograma: Histograma
+
+    def percentil(self, q: float) -> float:
+        return self.histograma.percentil(q)
+
+
+class _AcumuladorROI:
+    def __init__(self, histograma: Histograma, receita_limite: float):
+        self.momentos = MediaVariancia()
+        self.histograma = histograma
+        self.receitas_baixas = ContadorLimite(receita_limite)
+
+    def combinar(self, outro: "_AcumuladorROI") -> None:
+        self.momentos.combinar(outro.momentos)
+        self.histograma.combinar(outro.histograma)
+        self.receitas_baixas.combinar(outro.receitas_baixas)
+
+
+class _TarefaROI:
+    """Sorteia um bloco de receitas e devolve o acumulador do ROI (serializável)."""
+
+    def __init__(self, investimento, receita_media, desvio, custo_operacional, receita_limite):
+        self.investimento = investimento
+        self.receita_media = receita_media
+        self.desvio = desvio
+        self.custo_operacional = custo_operacional
+        self.receita_limite = receita_limite
+
+    def faixa_roi(self):
+        amplitude = DESVIOS_HISTOGRAMA * max(self.desvio, 1e-9)
+        return tuple(calcular_roi(self.investimento, self.receita_media + sinal * amplitude,
+                                  self.custo_operacional) for sinal in (-1, 1))
+
+    def __call__(self, gerador: np.random.Generator, tamanho: int) -> _AcumuladorROI:
+        receitas = gerador.normal(self.receita_media, self.desvio, size=tamanho)
+        rois = (receitas - self.custo_operacional) / self.investimento * 100
+        acumulador = _AcumuladorROI(Histograma(*self.faixa_roi()), self.receita_limite)
+        acumulador.momentos.adicionar(rois)
+        acumulador.histograma.adicionar(rois)
+        acumulador.receitas_baixas.adicionar(receitas)
+        return acumulador
+
+
+def calcular_roi(investimento: float, receita: float, custo_operacional: float) -> float:
+    """ROI anual em %: ``(receita - custo) / investimento * 100``."""
+    return (receita - custo_operacional) / investimento * 100
+
+
+def simular_roi(investimento: float, receita_media: float, desvio: float,
+                custo_operacional: float, simulacoes: int, receita_limite: float,
+                rng: Optional[np.random.Generator] = None, semente: Optional[int] = None,
+                trabalhadores: int = 1, tamanho_bloco: int = TAMANHO_BLOCO) -> SimulacaoROI:
+    """Simula ``simulacoes`` cenários de receita ~ Normal(receita_media, desvio).
+
+    As receitas são sorteadas em blocos com fluxos derivados de ``semente``
+    (ver :mod:`motor.montecarlo`), opcionalmente em ``trabalhadores``
+    processos, e cada bloco alimenta acumuladores de média/variância,
+    histograma do ROI e contagem de receitas abaixo de ``receita_limite``: a
+    memória é a de um bloco, qualquer que seja ``simulacoes``. Os percentis
+    vêm do histograma, com erro de no máximo uma faixa (±8 desvios-padrão em
+    2000 faixas). ``rng`` permite passar um gerador próprio, usado em um
+    único bloco.
+    """
+    if simulacoes <= 0:
+        raise ValueError("simulacoes deve ser positivo.")
+    tarefa = _TarefaROI(investimento, receita_media, desvio, custo_operacional, receita_limite)
+    if rng is not None:
+        acumulador = tarefa(rng, simulacoes)
+    else:
+        acumulador = executar_em_blocos(tarefa, simulacoes, semente, trabalhadores, tamanho_bloco)
+    return _resumir(acumulador, simulacoes)
+
+
+def iniciar_simulacao_roi(investimento: float, receita_media: float, desvio: float,
+                          custo_operacional: float, simulacoes: int, receita_limite: float,
+                          semente: Optional[int] = None, trabalhadores: int = 1,
+                          tamanho_bloco: int = TAMANHO_BLOCO, abandono: Optional[float] = None) -> Trabalho:
+    """Versão de :func:`simular_roi` em segundo plano (ver :mod:`motor.tarefas`).
+
+    ``parcial()`` devolve um :class:`SimulacaoROI` com os blocos já
+    concluídos; ao terminar, é igual ao de :func:`simular_roi` com os mesmos
+    argumentos. ``abandono``: ver :class:`motor.tarefas.Trabalho`.
+    """
+    if simulacoes <= 0:
+        raise ValueError("simulacoes deve ser positivo.")
+    tarefa = _TarefaROI(investimento, receita_media, desvio, custo_operacional, receita_limite)
+    return submeter(tarefa, simulacoes, _resumir, semente, trabalhadores, tamanho_bloco, abandono)
+
+
+def _resumir(acumulador: _AcumuladorROI, simulacoes: int) -> SimulacaoROI:
+    return SimulacaoROI(
+        simulacoes=simulacoes,
+        realista=acumulador.momentos.media,
+        desvio=acumulador.momentos.desvio,
+        minimo=acumulador.momentos.minimo,
+        maximo=acumulador.momentos.maximo,
+        otimista=acumulador.histograma.percentil(90),
+        pessimista=acumulador.histograma.percentil(10),
+        prob_receita_baixa=acumulador.receitas_baixas.proporcao * 100,
+        histograma=acumulador.histograma,
+    )
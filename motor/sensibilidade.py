@@ -0,0 +1,93 @@
+"""Análise de sensibilidade da decisão de ROI (aba 3).
+
+Em vez de mover os sliders um a um, varre uma grade de investimento,
+receita, custo operacional e ROI esperado numa única operação com
+broadcasting: o ROI de cada combinação e a faixa de decisão correspondente
+(:func:`motor.decisao.indices_faixas`) saem de arrays 4-D. Os resultados são
+memoizados por parâmetros.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from motor.cache import memoizar
+from motor.decisao import ORDEM_CRESCENTE, indices_faixas, proporcoes_roi
+
+VARIAVEIS = ("investimento", "receita", "custo_operacional", "roi_esperado")
+
+
+@dataclass(frozen=True)
+class GradeDecisao:
+    """ROI e faixa de decisão para cada combinação da grade (eixos na ordem de ``VARIAVEIS``).
+
+    ``rois`` tem forma (investimento, receita, custo) e ``faixas`` tem
+    forma (investimento, receita, custo, roi_esperado).
+    """
+
+    eixos: dict
+    rois: np.ndarray
+    faixas: np.ndarray
+
+    def fatia(self, eixo_x: str, eixo_y: str, base: dict) -> np.ndarray:
+        """Faixas 2-D (``eixo_y`` × ``eixo_x``) com as demais variáveis no ponto mais próximo de ``base``."""
+        indices = []
+        for nome in VARIAVEIS:
+            if nome in (eixo_x, eixo_y):
+                indices.append(slice(None))
+            else:
+                indices.append(int(np.abs(self.eixos[nome] - base[nome]).argmin()))
+        fatia = self.faixas[tuple(indices)]
+        livres = [nome for nome in VARIAVEIS if nome in (eixo_x, eixo_y)]
+        return fatia if livres == [eixo_y, eixo_x] else fatia.T
+
+
+@dataclass(frozen=True)
+class BarraTornado:
+    variavel: str
+    proporcao_baixa: float
+    proporcao_alta: float
+    faixa_baixa: str
+    faixa_alta: str
+
+    @property
+    def amplitude(self) -> float:
+        return abs(self.proporcao_alta - self.proporcao_baixa)
+
+
+@memoizar(tamanho_maximo=32)
+def grade_decisao(investimentos: tuple, receitas: tuple, custos: tuple, rois_esperados: tuple) -> GradeDecisao:
+    """Avalia todas as combinações de uma vez (tuplas para permitir a memoização)."""
+    eixos = {nome: np.asarray(valores, dtype=float)
+             for nome, valores in zip(VARIAVEIS, (investimentos, receitas, custos, rois_esperados))}
+    investimento = eixos["investimento"][:, None, None]
+    receita = eixos["receita"][None, :, None]
+    custo = eixos["custo_operacional"][None, None, :]
+    rois = (receita - custo) / investimento * 100
+    faixas = indices_faixas(proporcoes_roi(rois[..., None], eixos["roi_esperado"])).astype(np.int8)
+    for array in (*eixos.values(), rois, faixas):
+        array.flags.writeable = False
+    return GradeDecisao(eixos, rois, faixas)
+
+
+@memoizar(tamanho_maximo=32)
+def tornado(investimento: float, receita: float, custo_operacional: float, roi_esperado: float,
+            variacao: float = 0.2) -> tuple:
+    """Proporção (ROI relativo ao esperado) variando cada entrada ±``variacao``.
+
+    As 8 combinações são uma matriz (2·variáveis × variáveis) de
+    multiplicadores aplicada ao ponto base. Barras em ordem decrescente de
+    amplitude.
+    """
+    base = np.array([investimento, receita, custo_operacional, roi_esperado], dtype=float)
+    multiplicadores = np.ones((2 * len(VARIAVEIS), len(VARIAVEIS)))
+    variaveis = np.arange(len(VARIAVEIS))
+    multiplicadores[2 * variaveis, variaveis] = 1 - variacao
+    multiplicadores[2 * variaveis + 1, variaveis] = 1 + variacao
+    pontos = multiplicadores * base
+    rois = (pontos[:, 1] - pontos[:, 2]) / pontos[:, 0] * 100
+    proporcoes = proporcoes_roi(rois, pontos[:, 3]).reshape(len(VARIAVEIS), 2)
+    faixas = indices_faixas(proporcoes)
+    barras = [BarraTornado(nome, float(baixa), float(alta), ORDEM_CRESCENTE[fb], ORDEM_CRESCENTE[fa])
+              for nome, (baixa, alta), (fb, fa) in zip(VARIAVEIS, proporcoes, faixas)]
+    return tuple(sorted(barras, key=lambda barra: barra.amplitude, reverse=True))
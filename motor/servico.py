@@ -0,0 +1,356 @@
+"""API JSON/HTTP e CLI sobre os motores de overbooking e ROI.
+
+Serviço leve (só biblioteca padrão + motor; não carrega Streamlit nem
+Plotly) para outros sistemas consultarem risco, limite de vendas e ROI::
+
+    python -m motor.servico servir --porta 8000 --trabalhadores 16
+    python -m motor.servico consultar limite_vendas '{"capacidade": 120, "p": 0.88, "risco_maximo": 7}'
+    python -m motor.servico consultar risco < itens.jsonl     # um item JSON por linha
+
+Cada rota aceita ``POST /<rota>`` com um objeto JSON (resposta: objeto) ou
+com ``{"itens": [...]}`` (resposta: ``{"resultados": [...]}``, um por item,
+com ``{"erro": ...}`` nos itens inválidos). Parâmetros fora do domínio
+(``p`` fora de [0, 1], números não finitos, investimento zero...) dão 400 ou
+``{"erro": ...}`` no item, nunca um ``NaN`` na resposta (que não é JSON
+válido). Lotes têm um orçamento de trabalho (:data:`ORCAMENTO`: soma de
+``simulacoes``, ``faixa`` ou ``excesso_maximo`` nos itens); acima dele a
+requisição inteira dá 400. ``GET /saude`` devolve as rotas e as
+estatísticas dos caches.
+
+A lógica fica em :class:`Servico`, independente do HTTP: :class:`ClienteLocal`
+a chama no próprio processo (para testes e uso embutido) com a mesma
+interface de :class:`ClienteHTTP`. Resultados são guardados num cache LRU
+compartilhado por rota, além dos caches do próprio motor; as requisições são
+atendidas por um pool fixo de threads. Uma conexão persistente ociosa por
+mais de ``TEMPO_OCIOSO`` segundos é fechada, liberando a thread do pool.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from motor.cache import CacheLRU, estatisticas_caches
+from motor.overbooking import curva_lucro, curva_risco, limite_vendas, risco_overbooking
+from motor.roi import calcular_roi, simular_roi
+
+TAMANHO_CACHE = int(os.environ.get("MOTOR_SERVICO_CACHE", "4096"))
+MAX_ITENS = 10_000
+MAX_SIMULACOES = 10_000_000
+MAX_CAPACIDADE = 1_000_000
+MAX_FAIXA = 10_000
+MAX_EXCESSO = 1_000
+# Teto da soma, sobre os itens de uma requisição, do parâmetro que define o
+# custo de cada rota: sem ele um lote de MAX_ITENS itens no máximo
+# individual chegaria a 10^11 sorteios
+ORCAMENTO = {
+    "simular_roi": ("simulacoes", None, MAX_SIMULACOES),
+    "curva_risco": ("faixa", 20, 100 * MAX_FAIXA),
+    "curva_lucro": ("excesso_maximo", 30, 100 * MAX_FAIXA),
+}
+TEMPO_OCIOSO = float(os.environ.get("MOTOR_SERVICO_OCIOSO", "5"))
+
+
+class ErroRequisicao(ValueError):
+    """Requisição inválida (HTTP 400)."""
+
+
+def _real(nome, valor, minimo=-math.inf, maximo=math.inf):
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError, OverflowError):
+        raise ErroRequisicao(f"'{nome}' deve ser um número.") from None
+    if not (math.isfinite(numero) and minimo <= numero <= maximo):
+        limites = []
+        if math.isfinite(minimo):
+            limites.append(f" ≥ {minimo:g}")
+        if math.isfinite(maximo):
+            limites.append(f" ≤ {maximo:g}")
+        raise ErroRequisicao(f"'{nome}' deve ser um número finito{' e'.join(limites)}.")
+    return numero
+
+
+def _inteiro(nome, valor, minimo=0, maximo=MAX_CAPACIDADE):
+    return int(_real(nome, valor, minimo, maximo))
+
+
+def _probabilidade(nome, valor):
+    return _real(nome, valor, 0.0, 1.0)
+
+
+def _risco(capacidade, vendidas, p):
+    capacidade = _inteiro("capacidade", capacidade)
+    vendidas = _inteiro("vendidas", vendidas)
+    return {"risco": float(risco_overbooking(capacidade, vendidas, _probabilidade("p", p)))}
+
+
+def _curva_risco(capacidade, p, faixa=20):
+    curva = curva_risco(_inteiro("capacidade", capacidade), _probabilidade("p", p),
+                        _inteiro("faixa", faixa, maximo=MAX_FAIXA))
+    return {"vendas": curva.vendas.tolist(), "riscos": curva.riscos.tolist()}
+
+
+def _limite_vendas(capacidade, p, risco_maximo):
+    return {"limite": limite_vendas(_inteiro("capacidade", capacidade), _probabilidade("p", p),
+                                    _real("risco_maximo", risco_maximo))}
+
+
+def _curva_lucro(capacidade, p, receita_passagem, custo_indenizacao, excesso_maximo=30):
+    curva = curva_lucro(_inteiro("capacidade", capacidade), _probabilidade("p", p),
+                        _real("receita_passagem", receita_passagem), _real("custo_indenizacao", custo_indenizacao),
+                        _inteiro("excesso_maximo", excesso_maximo, maximo=MAX_EXCESSO))
+    return {"excesso_otimo": curva.excesso_otimo, "lucro_otimo": curva.lucro_otimo,
+            "preteridos": curva.preteridos.tolist(), "lucros": curva.lucros.tolist()}
+
+
+def _investimento(valor, positivo=False):
+    investimento = _real("investimento", valor)
+    if investimento == 0 or (positivo and investimento < 0):
+        raise ErroRequisicao(f"'investimento' deve ser {'positivo' if positivo else 'diferente de zero'}.")
+    return investimento
+
+
+def _roi(investimento, receita, custo_operacional):
+    return {"roi": calcular_roi(_investimento(investimento), _real("receita", receita),
+                                _real("custo_operacional", custo_operacional))}
+
+
+def _simular_roi(investimento, receita_media, desvio, custo_operacional, simulacoes, receita_limite,
+                 semente=42):
+    simulacao = simular_roi(_investimento(investimento, positivo=True), _real("receita_media", receita_media),
+                            _real("desvio", desvio, minimo=0), _real("custo_operacional", custo_operacional),
+                            _inteiro("simulacoes", simulacoes, 1, MAX_SIMULACOES),
+                            _real("receita_limite", receita_limite), semente=_inteiro("semente", semente, 0, 2**63 - 1))
+    return {"realista": simulacao.realista, "desvio": simulacao.desvio, "otimista": simulacao.otimista,
+            "pessimista": simulacao.pessimista, "prob_receita_baixa": simulacao.prob_receita_baixa}
+
+
+ROTAS = {
+    "risco": _risco,
+    "curva_risco": _curva_risco,
+    "limite_vendas": _limite_vendas,
+    "curva_lucro": _curva_lucro,
+    "roi": _roi,
+    "simular_roi": _simular_roi,
+}
+
+
+def _custo(rota, itens):
+    """Soma do parâmetro de custo da rota nos itens (itens malformados contam zero e serão recusados)."""
+    parametro, padrao, _ = ORCAMENTO[rota]
+    total = 0.0
+    for item in itens:
+        try:
+            valor = float(item.get(parametro, padrao))
+        except (AttributeError, TypeError, ValueError, OverflowError):
+            continue
+        if math.isfinite(valor) and valor > 0:
+            total += valor
+    return total
+
+
+def _finito(resultado: dict) -> dict:
+    """Garante que o resultado é JSON válido (sem ``NaN``/``Infinity``)."""
+    try:
+        json.dumps(resultado, allow_nan=False)
+    except ValueError:
+        raise ErroRequisicao("O resultado não é finito para esses parâmetros.") from None
+    return resultado
+
+
+class Servico:
+    """Despacha itens JSON para as rotas, com cache de resultados por rota."""
+
+    def __init__(self, tamanho_cache: int = TAMANHO_CACHE):
+        self._caches = {rota: CacheLRU(f"servico.{rota}", tamanho_cache) for rota in ROTAS}
+
+    def calcular(self, rota: str, item: dict) -> dict:
+        if rota not in ROTAS:
+            raise KeyError(rota)
+        if not isinstance(item, dict):
+            raise ErroRequisicao("Cada item deve ser um objeto JSON.")
+        chave = json.dumps(item, sort_keys=True)
+        try:
+            return self._caches[rota].obter(chave, lambda: _finito(ROTAS[rota](**item)))
+        except TypeError as erro:
+            raise ErroRequisicao(f"Parâmetros inválidos para '{rota}': {erro}") from erro
+        except ArithmeticError as erro:  # divisão por zero, overflow...
+            raise ErroRequisicao(f"Parâmetros inválidos para '{rota}': {erro}") from erro
+
+    def tratar(self, rota: str, corpo) -> tuple:
+        """Responde a um corpo já decodificado: ``(status HTTP, objeto JSON)``."""
+        if rota not in ROTAS:
+            return 404, {"erro": f"Rota desconhecida: {rota}", "rotas": sorted(ROTAS)}
+        if isinstance(corpo, dict) and "itens" in corpo:
+            itens = corpo["itens"]
+            if not isinstance(itens, list) or len(itens) > MAX_ITENS:
+                return 400, {"erro": f"'itens' deve ser uma lista com até {MAX_ITENS} objetos."}
+            if rota in ORCAMENTO and _custo(rota, itens) > ORCAMENTO[rota][2]:
+                parametro, _, teto = ORCAMENTO[rota]
+                return 400, {"erro": f"A soma de '{parametro}' nos itens não pode passar de {teto}."}
+            return 200, {"resultados": [self._tratar_item(rota, item)[1] for item in itens]}
+        return self._tratar_item(rota, corpo)
+
+    def _tratar_item(self, rota, item):
+        """``(status, objeto)`` de um item; erros não derrubam o restante do lote."""
+        try:
+            return 200, self.calcular(rota, item)
+        except ValueError as erro:
+            return 400, {"erro": str(erro)}
+        except Exception as erro:  # falha inesperada do motor: responde em vez de fechar a conexão
+            return 500, {"erro": f"Erro interno em '{rota}': {type(erro).__name__}: {erro}"}
+
+    def saude(self) -> dict:
+        estatisticas = estatisticas_caches() + [cache.estatisticas() for cache in self._caches.values()]
+        return {"ok": True, "rotas": sorted(ROTAS),
+                "caches": [{**asdict(e), "taxa_acerto": e.taxa_acerto} for e in estatisticas]}
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # conexões persistentes (keep-alive)
+    # Cabeçalhos e corpo saem em dois envios; com o Nagle ligado o segundo
+    # espera o ACK atrasado do cliente (~40 ms por requisição em keep-alive)
+    disable_nagle_algorithm = True
+
+    @property
+    def timeout(self):
+        # Tempo máximo esperando a próxima requisição (ou o restante do corpo)
+        # antes de fechar a conexão e liberar a thread do pool
+        return self.server.tempo_ocioso
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/saude":
+            self._responder(200, self.server.servico.saude())
+        else:
+            self._responder(404, {"erro": "Use POST /<rota> ou GET /saude."})
+
+    def do_POST(self):
+        try:
+            tamanho = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            # Sem um tamanho válido não há como achar o fim do corpo: responde e fecha
+            self.close_connection = True
+            self._responder(400, {"erro": "Cabeçalho Content-Length inválido."})
+            return
+        try:
+            corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+        except json.JSONDecodeError as erro:
+            self._responder(400, {"erro": f"JSON inválido: {erro}"})
+            return
+        self._responder(*self.server.servico.tratar(self.path.strip("/"), corpo))
+
+    def _responder(self, status, dados):
+        conteudo = json.dumps(dados, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, formato, *args):  # sem log por requisição no caminho quente
+        pass
+
+
+class ServidorHTTP(HTTPServer):
+    """``HTTPServer`` que atende as conexões num pool fixo de ``trabalhadores`` threads.
+
+    Cada conexão ocupa uma thread enquanto está aberta; conexões ociosas por
+    mais de ``tempo_ocioso`` segundos são fechadas.
+    """
+
+    def __init__(self, endereco, servico: Servico, trabalhadores: int = 16,
+                 tempo_ocioso: float = TEMPO_OCIOSO):
+        super().__init__(endereco, _Manipulador)
+        self.servico = servico
+        self.tempo_ocioso = tempo_ocioso
+        self._pool = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="servico")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ClienteLocal:
+    """Cliente que chama o :class:`Servico` no próprio processo, passando por JSON como o HTTP."""
+
+    def __init__(self, servico: Servico = None):
+        self.servico = servico or Servico()
+
+    def consultar(self, rota: str, corpo) -> tuple:
+        status, dados = self.servico.tratar(rota, json.loads(json.dumps(corpo)))
+        return status, json.loads(json.dumps(dados, allow_nan=False))
+
+
+class ClienteHTTP:
+    """Cliente mínimo para um :class:`ServidorHTTP` (mesma interface do :class:`ClienteLocal`)."""
+
+    def __init__(self, url: str = "http://127.0.0.1:8000", timeout: float = 30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def consultar(self, rota: str, corpo) -> tuple:
+        requisicao = urllib.request.Request(f"{self.url}/{rota}", data=json.dumps(corpo).encode("utf-8"),
+                                            headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(requisicao, timeout=self.timeout) as resposta:
+                return resposta.status, json.load(resposta)
+        except urllib.error.HTTPError as erro:
+            return erro.code, json.load(erro)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API e CLI do motor de overbooking e ROI.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    servir = comandos.add_parser("servir", help="inicia o servidor HTTP")
+    servir.add_argument("--host", default="127.0.0.1")
+    servir.add_argument("--porta", type=int, default=8000)
+    servir.add_argument("--trabalhadores", type=int, default=16)
+    servir.add_argument("--ocioso", type=float, default=TEMPO_OCIOSO,
+                        help="segundos até fechar uma conexão persistente ociosa")
+    consultar = comandos.add_parser("consultar", help="calcula uma rota sem servidor")
+    consultar.add_argument("rota", choices=sorted(ROTAS))
+    consultar.add_argument("json", nargs="?", help="objeto JSON; sem ele, lê um item por linha da entrada")
+    args = parser.parse_args(argv)
+
+    if args.comando == "servir":
+        servidor = ServidorHTTP((args.host, args.porta), Servico(), args.trabalhadores, args.ocioso)
+        print(f"Servindo em http://{args.host}:{args.porta} ({args.trabalhadores} trabalhadores)")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+        return 0
+
+    cliente = ClienteLocal()
+    linhas = [args.json] if args.json else [linha for linha in sys.stdin if linha.strip()]
+    codigo = 0
+    for linha in linhas:
+        status, dados = cliente.consultar(args.rota, json.loads(linha))
+        print(json.dumps(dados, ensure_ascii=False))
+        codigo = codigo or (status != 200)
+    return int(codigo)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Tabela pré-calculada de risco de overbooking para o domínio dos sliders da aba 1.
+
+A tabela cobre capacidade 100–200, vendas de ``capacidade`` a
+``capacidade + 30`` e ``p`` de 0,80 a 1,00 em passos de 0,01; é gerada uma
+única vez e gravada como ``.npy``::
+
+    python -m motor.tabela_risco            # grava em motor/dados/risco_binomial.npy
+
+O caminho pode ser trocado pela variável ``MOTOR_TABELA_RISCO``. O arquivo só
+é aberto (mapeado em memória) na primeira consulta, então importar o motor
+ou iniciar o app não paga por ele; se não existir, as consultas devolvem
+``None`` e quem chama usa o SciPy. Valores de ``p`` fora da grade também vão
+para o SciPy: interpolar entre colunas da grade erra o risco em até 0,2
+(absoluto) onde a curva é íngreme, o que não serve para limites de venda.
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+import numpy as np
+from scipy.stats import binom
+
+CAPACIDADE_MIN, CAPACIDADE_MAX = 100, 200
+EXCESSO_MAX = 30
+P_MIN, P_PASSO, P_PONTOS = 0.80, 0.01, 21
+
+CAMINHO_PADRAO = os.environ.get(
+    "MOTOR_TABELA_RISCO", os.path.join(os.path.dirname(__file__), "dados", "risco_binomial.npy"))
+
+_trava = threading.Lock()
+_carregada = False
+_tabela = None
+
+
+def grade_p() -> np.ndarray:
+    return P_MIN + P_PASSO * np.arange(P_PONTOS)
+
+
+def gerar_tabela() -> np.ndarray:
+    """Riscos com forma ``(capacidade, excesso, p)`` em uma chamada de ``binom.sf``."""
+    capacidades = np.arange(CAPACIDADE_MIN, CAPACIDADE_MAX + 1)[:, None, None]
+    excessos = np.arange(EXCESSO_MAX + 1)[None, :, None]
+    return binom.sf(capacidades, capacidades + excessos, grade_p()[None, None, :])
+
+
+def gravar_tabela(caminho: str = CAMINHO_PADRAO) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    np.save(caminho, gerar_tabela())
+    recarregar()
+    return caminho
+
+
+def tabela():
+    """A tabela mapeada em memória (somente leitura) ou ``None`` se não foi gerada."""
+    global _carregada, _tabela
+    if not _carregada:
+        with _trava:
+            if not _carregada:
+                if os.path.exists(CAMINHO_PADRAO):
+                    _tabela = np.load(CAMINHO_PADRAO, mmap_mode="r")
+                _carregada = True
+    return _tabela
+
+
+def recarregar() -> None:
+    """Esquece a tabela carregada; a próxima consulta abre o arquivo de novo."""
+    global _carregada, _tabela
+    with _trava:
+        _carregada, _tabela = False, None
+
+
+def indice_p(p: float):
+    """Índice de ``p`` na grade, ou ``None`` se ``p`` não cair exatamente em um ponto."""
+    posicao = (p - P_MIN) / P_PASSO
+    indice = int(round(posicao))
+    if 0 <= indice < P_PONTOS and abs(posicao - indice) < 1e-6:
+        return indice
+    return None
+
+
+def linha_risco(capacidade: int, p: float):
+    """Riscos de ``capacidade + 0..30`` vendas para ``p`` na grade, ou ``None``."""
+    riscos = tabela()
+    indice = indice_p(p)
+    if riscos is None or indice is None or not CAPACIDADE_MIN <= capacidade <= CAPACIDADE_MAX:
+        return None
+    return riscos[capacidade - CAPACIDADE_MIN, :, indice]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Gera a tabela pré-calculada de risco de overbooking.")
+    parser.add_argument("--saida", default=CAMINHO_PADRAO, help="arquivo .npy de saída (o motor lê o de MOTOR_TABELA_RISCO)")
+    args = parser.parse_args(argv)
+    caminho = gravar_tabela(args.saida)
+    print(f"Tabela de risco gravada em {caminho}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
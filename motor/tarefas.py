@@ -0,0 +1,117 @@
+"""Simulações longas em segundo plano, com progresso, parciais e cancelamento.
+
+:func:`submeter` inicia a simulação em uma thread (que pode, por sua vez,
+usar o pool de processos de :mod:`motor.paralelo`) e devolve na hora um
+:class:`Trabalho`. Quem chama — p. ex. um rerun do Streamlit — guarda o
+objeto e consulta ``progresso`` e ``parcial()`` sem bloquear; ``cancelar()``
+interrompe a simulação entre um bloco e outro. Com ``abandono``, o trabalho
+também se cancela sozinho quando ninguém o consulta há tantos segundos (a
+sessão que o acompanhava acabou, a aba foi fechada...). Os blocos são combinados na
+mesma ordem da execução síncrona, então o resultado final é idêntico ao de
+:func:`motor.paralelo.executar_em_blocos`.
+"""
+
+import copy
+import threading
+import time
+from typing import Callable, Optional
+
+from motor.montecarlo import TAMANHO_BLOCO
+from motor.paralelo import iterar_blocos
+
+
+class Trabalho:
+    """Handle de uma simulação em andamento (thread-safe)."""
+
+    def __init__(self, tarefa: Callable, total: int, resumir: Callable, semente: Optional[int] = None,
+                 trabalhadores: int = 1, tamanho_bloco: int = TAMANHO_BLOCO, abandono: Optional[float] = None):
+        self.total = total
+        self.abandono = abandono
+        self._resumir = resumir
+        self._consultado = time.monotonic()
+        self._esperando = 0
+        self._trava = threading.Lock()
+        self._cancelado = threading.Event()
+        self._concluido = threading.Event()
+        self._acumulador = None
+        self._feitos = 0
+        self.erro = None
+        self._thread = threading.Thread(
+            target=self._executar, args=(tarefa, semente, trabalhadores, tamanho_bloco), daemon=True)
+        self._thread.start()
+
+    def _executar(self, tarefa, semente, trabalhadores, tamanho_bloco):
+        try:
+            for tamanho, resultado in iterar_blocos(tarefa, self.total, semente, trabalhadores,
+                                                    tamanho_bloco, self._cancelado):
+                with self._trava:
+                    if self._acumulador is None:
+                        self._acumulador = resultado
+                    else:
+                        self._acumulador.combinar(resultado)
+                    self._feitos += tamanho
+                if self._abandonado():
+                    self._cancelado.set()
+        except Exception as erro:  # entregue a quem consulta o trabalho
+            self.erro = erro
+        finally:
+            self._concluido.set()
+
+    def _abandonado(self) -> bool:
+        return (self.abandono is not None and not self._esperando
+                and time.monotonic() - self._consultado > self.abandono)
+
+    def _consultar(self) -> None:
+        self._consultado = time.monotonic()
+
+    @property
+    def feitos(self) -> int:
+        self._consultar()
+        return self._feitos
+
+    @property
+    def progresso(self) -> float:
+        self._consultar()
+        return self._feitos / self.total if self.total else 1.0
+
+    @property
+    def concluido(self) -> bool:
+        """Terminou, foi cancelado ou falhou."""
+        self._consultar()
+        return self._concluido.is_set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado.is_set()
+
+    def cancelar(self) -> None:
+        self._cancelado.set()
+
+    def parcial(self):
+        """Resultado com os blocos concluídos até agora, ou ``None`` se nenhum terminou."""
+        self._consultar()
+        with self._trava:
+            if self._acumulador is None:
+                return None
+            acumulador, feitos = copy.deepcopy(self._acumulador), self._feitos
+        return self._resumir(acumulador, feitos)
+
+    def resultado(self, timeout: Optional[float] = None):
+        """Espera o término e devolve o resultado final (ou o parcial, se cancelado)."""
+        with self._trava:  # quem espera não abandona o trabalho
+            self._esperando += 1
+        try:
+            self._concluido.wait(timeout)
+        finally:
+            with self._trava:
+                self._esperando -= 1
+            self._consultar()
+        if self.erro is not None:
+            raise self.erro
+        return self.parcial()
+
+
+def submeter(tarefa: Callable, total: int, resumir: Callable, semente: Optional[int] = None,
+             trabalhadores: int = 1, tamanho_bloco: int = TAMANHO_BLOCO, abandono: Optional[float] = None) -> Trabalho:
+    """Inicia ``tarefa`` em segundo plano; ``resumir(acumulador, feitos)`` monta o resultado."""
+    return Trabalho(tarefa, total, resumir, semente, trabalhadores, tamanho_bloco, abandono)
@@ -0,0 +1,29 @@
+from motor.servico import ClienteLocal
+
+RISCO = {"capacidade": 120, "vendidas": 130, "p": 0.88}
+
+
+def test_item_unico():
+    status, dados = ClienteLocal().consultar("risco", RISCO)
+    assert status == 200
+    assert 0 < dados["risco"] < 1
+
+
+def test_lote_com_item_invalido():
+    status, dados = ClienteLocal().consultar("risco", {"itens": [RISCO, {**RISCO, "p": 1.5}]})
+    assert status == 200
+    valido, invalido = dados["resultados"]
+    assert "risco" in valido
+    assert "p" in invalido["erro"]
+
+
+def test_parametro_invalido_da_400():
+    status, dados = ClienteLocal().consultar("roi", {"investimento": 0, "receita": 1, "custo_operacional": 0})
+    assert status == 400
+    assert "investimento" in dados["erro"]
+
+
+def test_rota_desconhecida_da_404():
+    status, dados = ClienteLocal().consultar("inexistente", RISCO)
+    assert status == 404
+    assert "risco" in dados["rotas"]